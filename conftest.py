@@ -1,4 +1,5 @@
 import logging
+from pathlib import Path
 
 import allure
 import pytest
@@ -6,9 +7,15 @@ from _pytest.nodes import Item
 from _pytest.runner import CallInfo
 from assertpy import assertpy
 
-from settings import Environment, settings
+from core.api.cassette import cassette_recorder
+from core.api.reference_cache import reference_cache
+from core.api.transport import connection_stats
+from settings import Environment, HttpBackend, settings
+from util.allure_steps import allure_steps_reducer
+from util.api.allure_reporting import api_calls_buffer
 from util.assertions.assertpy_extensions import AssertPyExtensions
 from util.labels import CustomLabels
+from util.polling import operation_timings
 
 
 @pytest.fixture(scope="session")
@@ -62,16 +69,29 @@ def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item
             item.add_marker(pytest.mark.skip("Skipping non ui smoke tests on production environment"))
 
 
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item: Item):
+    api_calls_buffer.clear()
+    cassette_recorder.use(item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item: Item):
+    yield
+    cassette_recorder.eject()
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item: Item, call: CallInfo):
     """
-    Attach snapshots on test failure
+    Attach snapshots and recorded API calls on test failure
     """
 
     outcome = yield
 
     result = outcome.get_result()
     if result.when in ("call", "setup") and result.failed:
+        api_calls_buffer.attach()
         if sessions_manager := item.funcargs.get("browser_sessions_manager"):
             for browser_instance in sessions_manager.active_sessions:
                 if not browser_instance.config.last_screenshot:
@@ -101,4 +121,46 @@ def pytest_report_header():
         f"  Base LMS API url = {settings.base_url_lms_api}",
         f"  Base Platform API url = {settings.base_url_platform_api}",
         f"  Base SCORM API url = {settings.base_url_scorm_api}",
+        "HTTP connections configuration:",
+        *(f"  {backend} = {settings.http_connection_settings(backend)}" for backend in HttpBackend),
     ]
+
+
+def pytest_sessionstart(session: pytest.Session):
+    operation_timings.load(Path(settings.polling_timings_file))
+    cassette_recorder.install()
+    allure_steps_reducer.install()
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    operation_timings.save(Path(settings.polling_timings_file))
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["connection_stats"] = connection_stats.as_dict()
+        session.config.workeroutput["reference_cache_stats"] = reference_cache.stats.as_dict()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    Collects HTTP connection and reference cache counters from xdist workers
+    """
+    connection_stats.merge(node.workeroutput.get("connection_stats", {}))
+    reference_cache.stats.merge(node.workeroutput.get("reference_cache_stats", {}))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if stats := connection_stats.as_dict():
+        terminalreporter.section("HTTP connections")
+        for backend, counters in stats.items():
+            terminalreporter.write_line(
+                f"  {backend}: {counters['requests']} requests, {counters['opened']} new connections, "
+                f"{counters['reused']} reused"
+            )
+
+    if stats := reference_cache.stats.as_dict():
+        terminalreporter.section("Reference cache")
+        for family, counters in stats.items():
+            terminalreporter.write_line(
+                f"  {family}: {counters['hits']} hits (requests saved), {counters['misses']} misses, "
+                f"{counters['invalidations']} invalidations"
+            )
@@ -1,11 +1,14 @@
 import os
+import time
 from types import NoneType
+from typing import Callable
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
 from requests import Response, Session
 
-from core.models.idp import LoginForm
+from core.api.token_cache import TokenKey, token_cache
+from core.models.idp import AccessToken, LoginForm
 from core.models.user import LabsUser, User
 from settings import Environment, settings
 from util.helpers import extract_value_from_html
@@ -17,34 +20,74 @@ client_data = {
 }
 
 
-def _auth_request(session: Session, data: dict):
-    response = session.post(settings.idp_token_url, data=data)
-    response.raise_for_status()
-    token = response.json()["access_token"]
-    session.headers.update({"Authorization": f"Bearer {token}"})
+def _get_token(
+    fetch: Callable[[], AccessToken], user_key: str | None, rejected_token: AccessToken | None = None
+) -> AccessToken:
+    """
+    Shares tokens between xdist workers if a user key is known, otherwise always requests a new one
+    """
+    if user_key is None or not settings.token_cache_enabled:
+        return fetch()
+
+    key = TokenKey(
+        stand=settings.base_url, user_key=user_key, client_id=client_data["client_id"], scope=client_data["scope"]
+    )
+    return token_cache.get_or_fetch(key, fetch, rejected_token)
+
+
+def _auth_request(
+    session: Session, data: dict, user_key: str | None = None, rejected_token: AccessToken | None = None
+) -> AccessToken:
+    def fetch() -> AccessToken:
+        response = session.post(settings.idp_token_url, data=data)
+        response.raise_for_status()
+        token_data = response.json()
+        return AccessToken(
+            access_token=token_data["access_token"],
+            token_type=token_data.get("token_type", "Bearer"),
+            expires_at=time.time() + token_data.get("expires_in", settings.default_token_lifetime),
+        )
 
+    token = _get_token(fetch, user_key, rejected_token)
+    session.headers.update({"Authorization": token.authorization_header})
+    return token
 
-def authorize_app(session: Session):
+
+def authorize_app(session: Session) -> AccessToken:
     data = {
         **client_data,
         "grant_type": "client_credentials",
     }
-    _auth_request(session, data)
+    return _auth_request(session, data)
 
 
-def authorize_platform_user(session: Session, user: User):
+def authorize_platform_user(
+    session: Session, user: User, user_key: str | None = None, rejected_token: AccessToken | None = None
+) -> AccessToken:
     data = {
         **user.dict(include={"username", "password"}),
         **client_data,
         "grant_type": "password",
     }
-    _auth_request(session, data)
-
+    return _auth_request(session, data, user_key, rejected_token)
+
+
+def authorize_labs_user(
+    session: Session, user: LabsUser, user_key: str | None = None, rejected_token: AccessToken | None = None
+) -> AccessToken:
+    def fetch() -> AccessToken:
+        response = session.post(url=f"{settings.base_url_labs}/api/auth/login", json={**user.dict(), **client_data})
+        response.raise_for_status()
+        # labs tokens don't report their lifetime
+        return AccessToken(
+            access_token=response.json().get("token"),
+            token_type="Token",
+            expires_at=time.time() + settings.default_token_lifetime,
+        )
 
-def authorize_labs_user(session: Session, user: LabsUser):
-    response = session.post(url=f"{settings.base_url_labs}/api/auth/login", json={**user.dict(), **client_data})
-    response.raise_for_status()
-    session.headers.update({"Authorization": f"Token {response.json().get('token')}"})
+    token = _get_token(fetch, user_key, rejected_token)
+    session.headers.update({"Authorization": token.authorization_header})
+    return token
 
 
 def authorize_user_with_cookies(session: Session, user: User):
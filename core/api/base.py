@@ -1,9 +1,20 @@
 from functools import cached_property
+from http import HTTPStatus
 from typing import Any, Generic, TypeVar, Union
 
+import allure
 from requests import Session
 
-from core.api.base_api import ApiModel, ObjectCreatableApi, ObjectDeleteableApi, ObjectGettableApi, ObjectUpdateableApi
+from core.api.base_api import (
+    ApiModel,
+    ObjectCreatableApi,
+    ObjectDeleteableApi,
+    ObjectGettableApi,
+    ObjectUpdateableApi,
+    check_response,
+)
+from core.api.conditional import conditional_headers, is_not_modified
+from core.api.decoding import parse_response
 from core.models.lms.lms_base import LMSModelBase
 
 ApiType = TypeVar("ApiType", bound=ObjectGettableApi)
@@ -15,6 +26,8 @@ class ApiObject(Generic[ApiModel, ApiType]):
     def __init__(self, session: Session, data: ApiModel):
         self.session = session
         self._data = data
+        # validators of the latest GET response to send conditional requests, see core.api.conditional
+        self._conditional_headers: dict[str, str] = {}
 
     @property
     def data(self) -> ApiModel:
@@ -29,7 +42,14 @@ class ApiObject(Generic[ApiModel, ApiType]):
         return self.data.id
 
     def sync(self):
-        self._data = self._api.get(self.id)
+        with allure.step(f"Get {self._api.NAME} with id: {self.id}"):
+            response = self._api.request_get(self.id, headers=self._conditional_headers)
+            if is_not_modified(response):
+                return
+
+            check_response(response, HTTPStatus.OK)
+            self._data = parse_response(response, self._api.MODEL)
+            self._conditional_headers = conditional_headers(response)
 
     def __eq__(self, other: Any):
         if isinstance(other, ApiObject):
@@ -47,6 +67,7 @@ UpdateApiType = TypeVar("UpdateApiType", bound=Union[ObjectGettableApi, ObjectUp
 class UpdatableApiObject(ApiObject[ApiModel, UpdateApiType]):
     def put(self, update_data: LMSModelBase):
         self._data = self._api.put(self.id, update_data)
+        self._conditional_headers = {}
 
 
 DeleteApiType = TypeVar("DeleteApiType", bound=Union[ObjectGettableApi, ObjectDeleteableApi])
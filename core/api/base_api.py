@@ -1,11 +1,13 @@
 import json
 from http import HTTPStatus
-from typing import ClassVar, Generic, Protocol, TypeVar, runtime_checkable
+from typing import ClassVar, Generic, Iterator, Protocol, TypeVar, runtime_checkable
 
 import allure
-from pydantic import BaseModel, parse_raw_as
+from pydantic import BaseModel
 from requests import Response, Session
 
+from core.api.decoding import parse_response
+from core.api.pagination import iter_pages
 from core.models.lms.lms_base import LMSModelBase
 from core.models.query import LoadOptions, QueryResponse
 from util.assertions.common_assertions import assert_response_status
@@ -50,15 +52,15 @@ class ObjectApi(Generic[ApiModel]):
 
 
 class ObjectGettableApi(ObjectApi[ApiModel]):
-    def request_get(self, obj_id: str) -> Response:
-        return self.session.get(self.get_instance_url(obj_id))
+    def request_get(self, obj_id: str, headers: dict[str, str] | None = None) -> Response:
+        return self.session.get(self.get_instance_url(obj_id), headers=headers)
 
     def get(self, obj_id: str) -> ApiModel:
         with allure.step(f"Get {self.NAME} with id: {obj_id}"):
             response = self.request_get(obj_id)
             check_response(response, HTTPStatus.OK)
 
-            return self.MODEL.parse_raw(response.text)
+            return parse_response(response, self.MODEL)
 
     def request_list(self) -> Response:
         return self.session.get(self.URL)
@@ -68,7 +70,7 @@ class ObjectGettableApi(ObjectApi[ApiModel]):
             response = self.request_list()
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(list[self.MODEL], response.text)
+            return parse_response(response, list[self.MODEL])
 
 
 class ObjectCreatableApi(ObjectApi[ApiModel], Generic[CreateApiModel, ApiModel]):
@@ -80,7 +82,7 @@ class ObjectCreatableApi(ObjectApi[ApiModel], Generic[CreateApiModel, ApiModel])
             response = self.request_post(create_data)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return self.MODEL.parse_raw(response.text)
+            return parse_response(response, self.MODEL)
 
 
 class ObjectUpdateableApi(ObjectApi[ApiModel], Generic[UpdateApiModel, ApiModel]):
@@ -96,7 +98,7 @@ class ObjectUpdateableApi(ObjectApi[ApiModel], Generic[UpdateApiModel, ApiModel]
             response = self.request_put(obj_id, data)
             check_response(response, HTTPStatus.OK)
 
-            return self.MODEL.parse_raw(response.text)
+            return parse_response(response, self.MODEL)
 
 
 class ObjectDeleteableApi(ObjectApi):
@@ -126,8 +128,32 @@ class ObjectQueryableApi(ObjectApi[ApiModel]):
         params = payload.lms_dict() if isinstance(payload, LoadOptions) else payload
         return self.session.get(f"{self.URL}/query", params=params)
 
-    def query(self, load_options: LoadOptions) -> QueryResponse[ApiModel]:
+    def query(self, load_options: LoadOptions, trusted: bool = False) -> QueryResponse[ApiModel]:
+        """
+        trusted: build models without validation, see core.api.decoding
+        """
         response = self.request_query(load_options)
         assert_response_status(response.status_code, HTTPStatus.OK)
 
-        return parse_raw_as(QueryResponse[self.MODEL], response.text)
+        return parse_response(response, QueryResponse[self.MODEL], trusted=trusted)
+
+    def iter_query(self, load_options: LoadOptions, page_size: int = 100, trusted: bool = False) -> Iterator[ApiModel]:
+        """
+        Iterates over all results of the query page by page, see core.api.pagination.iter_pages.
+        skip and take of load_options limit the whole iteration.
+        The total count is requested with the first page only, it tells which page is the last one.
+        """
+        first_skip = load_options.skip or 0
+        total_count: int | None = None
+
+        def fetch_page(skip: int, take: int) -> tuple[list[ApiModel], bool]:
+            nonlocal total_count
+            update = {"skip": skip, "take": take}
+            if skip == first_skip:
+                update["requireTotalCount"] = True
+            page = self.query(load_options.copy(update=update), trusted=trusted)
+            if page.total_count is not None:
+                total_count = page.total_count
+            return page.data, total_count is not None and skip + len(page.data) >= total_count
+
+        return iter_pages(fetch_page, page_size, offset=first_skip, limit=load_options.take)
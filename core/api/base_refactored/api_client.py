@@ -56,9 +56,9 @@ class SingleItemApiClient(ApiClient):
             response = self.api_session.delete(url=self.url)
             return response
 
-    def request_get(self) -> requests.Response:
+    def request_get(self, headers: dict[str, str] | None = None) -> requests.Response:
         with allure.step(f"getting {self}"):
-            response = self.api_session.get(url=self.url)
+            response = self.api_session.get(url=self.url, headers=headers)
             return response
 
     def request_put(self, update_data: DataPayload) -> requests.Response:
@@ -3,18 +3,21 @@ import enum
 import http
 import logging
 from abc import ABC
-from typing import Generic, List, Type, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generic, Iterable, Iterator, List, Type, TypeVar
 
 import allure
 import requests
 from pydantic import BaseModel
 from requests import Response, Session
-from waiting import wait
 
 from core.api.base_refactored.api_client import ManagerApiClient, SingleItemApiClient
+from core.api.conditional import conditional_headers, is_not_modified
+from core.api.pagination import iter_pages
 from settings import settings
 from util.api.allure_reporting import prettify_dict
 from util.assertions import common_assertions
+from util.polling import Poller
 
 ApiWrap = TypeVar("ApiWrap", bound="ApiWrapper")
 DataModel = TypeVar("DataModel", bound=BaseModel)
@@ -58,6 +61,8 @@ class ApiWrapper(Generic[SingleClient, DataModel], ABC):
         self.is_exist_on_backend: bool = True
         self.originally_was_created_with: DataModel | None = None
         self.latest_response: requests.Response | None = None
+        # validators of the latest GET response to send conditional requests, see core.api.conditional
+        self.conditional_headers: dict[str, str] = {}
 
     @property
     def api_session(self):
@@ -77,11 +82,20 @@ class ApiWrapper(Generic[SingleClient, DataModel], ABC):
     def _update_inner_data(self, response: requests.Response):
         data = response.json()
         self.latest_response = response
+        self.conditional_headers = conditional_headers(response) if response.request.method == "GET" else {}
         if data in ({}, None) and self.data is None:
             return
         self.previous_data = self.data
         self.data = self.DATA_MODEL(**data)
 
+    def _update_from_get(self, response: requests.Response):
+        """Updates the data from a response to a conditional GET. 304 means the data is already up to date."""
+        if is_not_modified(response):
+            self.previous_data = self.data
+            return
+        response.raise_for_status()
+        self._update_inner_data(response)
+
     @property
     def name(self):
         return getattr(self.data, self.NAME_KEY_IN_PAYLOAD, None) or getattr(
@@ -146,12 +160,15 @@ class PuttableWrapper(ApiWrapper[SingleClient, DataModel], Generic[SingleClient,
 
 class GettableWrapper(ApiWrapper[SingleClient, DataModel], Generic[SingleClient, DataModel]):
     def fetch_data(self) -> requests.Response:
-        response = self.api.request_get()
+        response = self.api.request_get(headers=self.conditional_headers)
+        return self._process_fetched_data(response)
 
+    def _process_fetched_data(self, response: requests.Response) -> requests.Response:
         # a special case for 404 without an exception
         if response.status_code == http.HTTPStatus.NOT_FOUND:
             self.is_exist_on_backend = False
             self.latest_response = response
+            self.conditional_headers = {}
 
             # if the data for a deleted object is fetched again, we still want to have a previous_data
             if self.data is not None:
@@ -159,8 +176,7 @@ class GettableWrapper(ApiWrapper[SingleClient, DataModel], Generic[SingleClient,
                 self.data = None
             return response
 
-        response.raise_for_status()
-        self._update_inner_data(response)
+        self._update_from_get(response)
         return response
 
 
@@ -199,20 +215,19 @@ class SelfStateChangingWrapper(ApiWrapper[SingleClient, DataModel], Generic[Sing
         Wait until SelfStateChangingObject is in state/status {desired_state}
         """
         state_value = desired_state.value
+        poller = Poller(f"{self.api.NAME} {self.STATE_KEY}={state_value}", timeout_seconds=timeout)
 
         def request_get_for_a_status():
-            get_response = self.api.request_get()
-            result = get_response if get_response.json()[self.STATE_KEY] == state_value else False
-            return result
+            get_response = self.api.request_get(headers=self.conditional_headers)
+            poller.honor_retry_after(get_response)
+            self._update_from_get(get_response)
+            return get_response if self.state == state_value else False
 
         with allure.step(f'Waiting until {self.api.NAME} is in {self.STATE_KEY} "{state_value}"'):
-            response = wait(
+            return poller.wait(
                 request_get_for_a_status,
                 waiting_for=f'until {self.api.NAME} is in {self.STATE_KEY} "{state_value}"',
-                timeout_seconds=timeout,
             )
-        self._update_inner_data(response)
-        return response
 
 
 class WrappersManager(Generic[ManagerClient, ApiWrap], ABC):
@@ -246,17 +261,65 @@ class CreatablesManager(WrappersManager[ManagerClient, ApiWrap], Generic[Manager
         if data is None:
             data = self.CREATE_MODEL()
         non_default_data = data.dict(exclude_unset=True)
+        self._log_creation(data, non_default_data)
+        with allure.step(
+            f"creating {self.SINGLE_OBJECT_CLASS.API_CLASS.NAME}"
+            f" with not default data={prettify_dict(non_default_data)}"
+        ):
+            response = self.api.request_post(data.dict())
+        return self._wrap_created_object(data, response)
+
+    def create_many(
+        self,
+        models: Iterable[DataModel | None],
+        teardown_bucket: list,
+        max_workers: int = settings.api_max_concurrent_requests,
+    ) -> list[ApiWrap]:
+        """Creates objects of self.SINGLE_OBJECT_CLASS concurrently
+
+        Args:
+            models: data to create objects with. None means random data like in create().
+            teardown_bucket: a bucket to add every created object to, even if some other objects were not created,
+                so that nothing created is left behind when an ExceptionGroup is raised
+            max_workers: how many objects may be created at the same time
+
+        Returns: created objects in the same order as models
+
+        Raises: ExceptionGroup with all creation errors after all the requests are finished
+
+        """
+        models = list(models)
+        with allure.step(f"creating {len(models)} objects of {self.SINGLE_OBJECT_CLASS.API_CLASS.NAME}"):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(self.create, model) for model in models]
+
+            created_objects = []
+            errors = []
+            for future in futures:
+                if error := future.exception():
+                    errors.append(error)
+                else:
+                    created_objects.append(future.result())
+
+            for single_object in created_objects:
+                teardown_bucket.append(single_object)
+
+            if errors:
+                raise ExceptionGroup(
+                    f"failed to create {len(errors)} of {len(models)} {self.SINGLE_OBJECT_CLASS.API_CLASS.NAME}",
+                    errors,
+                )
+            return created_objects
+
+    def _log_creation(self, data: DataModel, non_default_data: dict):
         object_element_name = (
             getattr(data, self.SINGLE_OBJECT_CLASS.NAME_KEY_IN_PAYLOAD, None)
             or str(non_default_data)
             or "random_generated"
         )
         logging.info(f"creating {self.SINGLE_OBJECT_CLASS.API_CLASS.NAME} {object_element_name}")
-        with allure.step(
-            f"creating {self.SINGLE_OBJECT_CLASS.API_CLASS.NAME}"
-            f" with not default data={prettify_dict(non_default_data)}"
-        ):
-            response = self.api.request_post(data.dict())
+
+    def _wrap_created_object(self, data: DataModel, response: Response) -> ApiWrap:
         common_assertions.assert_response_status(response.status_code, http.HTTPStatus.CREATED)
         single_object = self.SINGLE_OBJECT_CLASS(self.api_session, response.json())
         single_object.originally_was_created_with = data
@@ -297,3 +360,22 @@ class QueryablesManager(WrappersManager[ManagerClient, ApiWrap], Generic[Manager
         ), f'Too many objects "{self.SINGLE_OBJECT_CLASS}" in a response: {(len(objects_list))}'
         result = [self.SINGLE_OBJECT_CLASS(api_session=self.api_session, data=item) for item in objects_list]
         return result
+
+    def iter_query(self, search_query: dict | None = None, page_size: int = 50) -> Iterator[ApiWrap]:
+        """
+        Lazily iterates over all objects matching the query, requesting them page by page with limit/offset.
+        The next page is requested in the background, see core.api.pagination.iter_pages.
+
+        Args:
+            search_query: search query, see swagger documentation
+            page_size: how many objects to request at once
+        """
+
+        def fetch_page(offset: int, limit: int) -> tuple[list[dict], bool]:
+            response = self.api.request_query(params={**(search_query or {}), "limit": limit, "offset": offset})
+            response.raise_for_status()
+            data = response.json()
+            return data["results"], "next" in data and data["next"] is None
+
+        for item in iter_pages(fetch_page, page_size):
+            yield self.SINGLE_OBJECT_CLASS(api_session=self.api_session, data=item)
@@ -0,0 +1,257 @@
+"""
+Record/replay of API calls at the transport adapter level.
+
+In the record mode every request sent by SessionManager sessions during a test is written with its response to a
+gzipped JSON cassette of the test. In the replay mode responses are served from the cassettes without network, so
+the API suite runs offline and the framework overhead can be measured on its own.
+
+Requests are matched by method and url, then by body, in the order they were recorded. Values that differ between
+runs (uuids, numbers, random names from util.random) are normalized before matching. Secrets (passwords, client
+secrets, tokens) are never written to cassettes, and replayed sessions are authorized with a dummy token.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError
+
+from core.api.reference_cache import CachedResponse
+from settings import CassetteMode, settings
+
+UUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+WORD_PATTERN = re.compile(r"[A-Za-z0-9]{8,}")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+SENSITIVE_KEYS = frozenset({"password", "client_secret", "access_token", "refresh_token", "id_token", "token"})
+REDACTED = "<redacted>"
+# headers which are not true for a replayed response: its content is already decoded
+SKIPPED_RESPONSE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+IDP_CONFIG_FILE_NAME = "idp_config.json"
+
+
+class CassetteMiss(ConnectionError):
+    pass
+
+
+def _is_random_word(word: str) -> bool:
+    has_digits = any(char.isdigit() for char in word)
+    has_letters = any(char.isalpha() for char in word)
+    is_mixed_case = word != word.lower() and word != word.upper()
+    return (has_digits and has_letters) or (is_mixed_case and len(word) >= 16)
+
+
+def normalize(text: str) -> str:
+    """Replaces values that differ between runs with placeholders"""
+    text = UUID_PATTERN.sub("<uuid>", text)
+    text = WORD_PATTERN.sub(lambda match: "<random>" if _is_random_word(match.group()) else match.group(), text)
+    return NUMBER_PATTERN.sub("<n>", text)
+
+
+def normalize_url(url: str) -> str:
+    scheme, netloc, path, query, _ = urlsplit(url)
+    return normalize(
+        urlunsplit((scheme, netloc, path, urlencode(sorted(parse_qsl(query, keep_blank_values=True))), ""))
+    )
+
+
+def _redact(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: REDACTED if key in SENSITIVE_KEYS else _redact(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _redact_json(content: bytes) -> bytes:
+    try:
+        return json.dumps(_redact(json.loads(content))).encode()
+    except ValueError:
+        return content
+
+
+def redacted_body(request: PreparedRequest) -> str:
+    body = request.body or ""
+    if isinstance(body, bytes):
+        body = body.decode(errors="replace")
+    if not isinstance(body, str):
+        return f"<{type(body).__name__} body>"
+
+    content_type = request.headers.get("Content-Type", "")
+    if "application/x-www-form-urlencoded" in content_type:
+        return urlencode([(key, REDACTED if key in SENSITIVE_KEYS else value) for key, value in parse_qsl(body)])
+    if "application/json" in content_type:
+        return _redact_json(body.encode()).decode()
+    return body
+
+
+def _interaction_key(method: str, url: str) -> str:
+    return f"{method} {normalize_url(url)}"
+
+
+class Cassette:
+    """
+    Recorded interactions of a single test
+    """
+
+    def __init__(self, path: Path, interactions: list[dict] | None = None):
+        self.path = path
+        self.interactions: list[dict] = interactions or []
+        self._unused: defaultdict[str, list[dict]] = defaultdict(list)
+        for interaction in self.interactions:
+            self._unused[_interaction_key(interaction["method"], interaction["url"])].append(interaction)
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        if not path.exists():
+            return cls(path)
+        with gzip.open(path, "rt") as file:
+            return cls(path, json.load(file))
+
+    def save(self):
+        if not self.interactions:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(self.path, "wt") as file:
+            json.dump(self.interactions, file, separators=(",", ":"))
+
+    def record(self, request: PreparedRequest, response: Response):
+        content = response.content
+        if "json" in response.headers.get("Content-Type", ""):
+            content = _redact_json(content)
+        recorded_response = CachedResponse(
+            stored_at=0,
+            status_code=response.status_code,
+            reason=response.reason,
+            headers={
+                key: value for key, value in response.headers.items() if key.lower() not in SKIPPED_RESPONSE_HEADERS
+            },
+            content=content,
+            encoding=response.encoding,
+        )
+
+        self.interactions.append(
+            {
+                "method": request.method,
+                "url": request.url,
+                "body": normalize(redacted_body(request)),
+                "response": recorded_response.to_json_dict(),
+            }
+        )
+
+    def find(self, request: PreparedRequest, consume: bool = True) -> CachedResponse | None:
+        candidates = self._unused.get(_interaction_key(request.method, request.url))
+        if not candidates:
+            return None
+
+        body = normalize(redacted_body(request))
+        interaction = next((candidate for candidate in candidates if candidate["body"] == body), candidates[0])
+        if consume:
+            candidates.remove(interaction)
+        return CachedResponse.from_json_dict(interaction["response"])
+
+
+class CassetteRecorder:
+    """
+    Switches cassettes between tests and records or replays requests of the transport adapters
+    """
+
+    def __init__(self, mode: CassetteMode, directory: Path):
+        self.mode = mode
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._cassette: Cassette | None = None
+        self._all_cassettes: list[Cassette] | None = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.mode != CassetteMode.OFF
+
+    def cassette_path(self, test_id: str) -> Path:
+        readable_name = re.sub(r"[^\w.-]+", "_", test_id)[-100:]
+        return self.directory / f"{readable_name}-{hashlib.sha256(test_id.encode()).hexdigest()[:8]}.json.gz"
+
+    def install(self):
+        """Makes the stand configuration, which is requested outside of sessions, recordable and replayable"""
+        idp_config_path = self.directory / IDP_CONFIG_FILE_NAME
+        if self.mode == CassetteMode.RECORD:
+            idp_config = {"token_endpoint": settings.idp_token_url}
+            self.directory.mkdir(parents=True, exist_ok=True)
+            idp_config_path.write_text(json.dumps(idp_config))
+        elif self.mode == CassetteMode.REPLAY:
+            if idp_config_path.exists():
+                idp_config = json.loads(idp_config_path.read_text())
+            else:
+                idp_config = {"token_endpoint": f"{settings.base_url_identity}connect/token"}
+            # settings._idp_config is a cached property, so the stand is never asked for it
+            settings.__dict__["_idp_config"] = idp_config
+
+    def use(self, test_id: str):
+        if not self.is_active:
+            return
+        with self._lock:
+            path = self.cassette_path(test_id)
+            self._cassette = Cassette.load(path) if self.mode == CassetteMode.REPLAY else Cassette(path)
+
+    def eject(self):
+        with self._lock:
+            cassette, self._cassette = self._cassette, None
+        if cassette is not None and self.mode == CassetteMode.RECORD:
+            cassette.save()
+
+    def send(
+        self, request: PreparedRequest, adapter: BaseAdapter, send: Callable[[PreparedRequest], Response]
+    ) -> Response:
+        if self.mode == CassetteMode.REPLAY:
+            return self._replay(request).to_response(request, adapter)
+
+        response = send(request)
+        if self.mode == CassetteMode.RECORD:
+            with self._lock:
+                if self._cassette is not None:
+                    self._cassette.record(request, response)
+        return response
+
+    def _replay(self, request: PreparedRequest) -> CachedResponse:
+        with self._lock:
+            recorded_response = self._cassette.find(request) if self._cassette else None
+            if recorded_response is None:
+                # e.g. session scoped fixtures are recorded in the cassette of a test which was the first one to run
+                recorded_response = next(
+                    (response for cassette in self._other_cassettes() if (response := cassette.find(request, False))),
+                    None,
+                )
+        if recorded_response is None:
+            recorded_response = self._authentication_response(request)
+        if recorded_response is None:
+            raise CassetteMiss(f"no recorded response for {request.method} {normalize_url(request.url)}")
+        return recorded_response
+
+    def _other_cassettes(self) -> list[Cassette]:
+        if self._all_cassettes is None:
+            self._all_cassettes = [Cassette.load(path) for path in sorted(self.directory.glob("*.json.gz"))]
+        return self._all_cassettes
+
+    @staticmethod
+    def _authentication_response(request: PreparedRequest) -> CachedResponse | None:
+        """Tokens taken from the token cache while recording are not in cassettes, so a dummy one is issued"""
+        if request.url == settings.idp_token_url:
+            body = {"access_token": REDACTED, "token_type": "Bearer", "expires_in": settings.default_token_lifetime}
+        elif request.url.endswith("/api/auth/login"):
+            body = {"token": REDACTED}
+        else:
+            return None
+        logging.debug(f"replaying a dummy token for {request.url}")
+        return CachedResponse(0, 200, "OK", {"Content-Type": "application/json"}, json.dumps(body).encode(), "utf-8")
+
+
+cassette_recorder = CassetteRecorder(mode=settings.api_cassette_mode, directory=Path(settings.api_cassette_dir))
@@ -0,0 +1,24 @@
+"""
+Conditional GET support.
+Objects remember the validators (ETag / Last-Modified) of the latest GET response and send them back, so a backend
+answers 304 Not Modified without a body when nothing has changed, and parsing and model rebuilding are skipped.
+"""
+from http import HTTPStatus
+
+from requests import Response
+
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+
+def conditional_headers(response: Response) -> dict[str, str]:
+    """Builds headers of a conditional request from validators of a GET response"""
+    headers = {}
+    if etag := response.headers.get("ETag"):
+        headers["If-None-Match"] = etag
+    if last_modified := response.headers.get("Last-Modified"):
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def is_not_modified(response: Response) -> bool:
+    return response.status_code == HTTPStatus.NOT_MODIFIED
@@ -0,0 +1,91 @@
+"""
+A single place where API responses are decoded into models.
+
+Bodies are decoded from response.content bytes with orjson, and a validating parser is built once per parse target,
+e.g. list[Command] or QueryResponse[ActivityModel].
+The trusted mode skips validation and builds models with construct(). It is meant for large read-only listings
+(reports, queries) whose data the test only reads: leaf values other than enums stay as decoded from JSON, so e.g.
+datetimes remain strings there.
+"""
+import types
+import typing
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, TypeVar
+
+import orjson
+from pydantic import BaseModel, create_model
+from requests import Response
+
+T = TypeVar("T")
+
+
+def decode_json(response: Response) -> Any:
+    return orjson.loads(response.content)
+
+
+@lru_cache(maxsize=None)
+def _validator(target: Any) -> Callable[[Any], Any]:
+    if isinstance(target, type) and issubclass(target, BaseModel):
+        return target.parse_obj
+
+    parsing_model = create_model(f"ParsingModel[{target}]", __root__=(target, ...))
+    return lambda value: parsing_model(__root__=value).__root__
+
+
+def _construct(target: Any, value: Any) -> Any:
+    if value is None:
+        return None
+
+    origin = typing.get_origin(target)
+    args = typing.get_args(target)
+
+    if origin in (list, set, frozenset, tuple) and isinstance(value, list):
+        item_type = args[0] if args else Any
+        return [_construct(item_type, item) for item in value]
+
+    if origin is dict and isinstance(value, dict):
+        value_type = args[1] if args else Any
+        return {key: _construct(value_type, item) for key, item in value.items()}
+
+    if origin in (typing.Union, types.UnionType):
+        for arg in args:
+            if arg is not type(None) and (not isinstance(value, dict) or _is_model(arg)):
+                return _construct(arg, value)
+        return value
+
+    if _is_model(target) and isinstance(value, dict):
+        return construct_model(target, value)
+
+    if isinstance(target, type) and issubclass(target, Enum):
+        return target(value)
+
+    return value
+
+
+def _is_model(target: Any) -> bool:
+    return isinstance(target, type) and issubclass(target, BaseModel)
+
+
+def construct_model(model: type[BaseModel], data: dict) -> BaseModel:
+    """Builds a model and its nested models from trusted data without validation"""
+    values = {}
+    for name, field in model.__fields__.items():
+        if field.alias in data:
+            values[name] = _construct(field.outer_type_, data[field.alias])
+        elif name in data:
+            values[name] = _construct(field.outer_type_, data[name])
+    return model.construct(_fields_set=set(values), **values)
+
+
+def parse_obj(target: type[T], value: Any, trusted: bool = False) -> T:
+    if trusted:
+        return _construct(target, value)
+    return _validator(target)(value)
+
+
+def parse_response(response: Response, target: type[T], trusted: bool = False) -> T:
+    """
+    Decodes the response body into target, e.g. parse_response(response, list[Command])
+    """
+    return parse_obj(target, decode_json(response), trusted=trusted)
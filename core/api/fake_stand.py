@@ -0,0 +1,797 @@
+"""
+A local fake of the stand backends to run core/api wrappers without a real stand, selected with STAND=local.
+
+- labs: CRUD of labs, tasks, steps, sessions, vms, images and other collections, links of tasks and steps, session
+  actions, images and vms getting ready
+- LMS: writes are async commands answered with an Operation, the Command completes and applies the change later;
+  /query with LoadOptions
+- SCORM and platform: CRUD and /query
+- IdP: the openid configuration and the token endpoint, labs login
+
+Scheduled changes (a command completion, a session start, an image or a vm getting ready) are due
+fake_stand_transition_seconds after a request and are applied when a later request comes, so the fake needs no
+threads of its own. Latency and error injection are configured with fake_stand_* settings, errors are chosen by a
+seeded random generator, so runs are reproducible.
+
+By default the transport adapters hand requests to the fake in process. With FAKE_STAND_IN_PROCESS=false requests go
+over HTTP to `python -m core.api.fake_stand`, which serves the fake on the host and port of the local stand url.
+`python -m core.api.fake_stand --check` checks that the fake accepts writes to the collections of the wrappers.
+"""
+import argparse
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, NamedTuple
+from urllib.parse import parse_qsl, urlsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+from core.api.reference_cache import CachedResponse
+from settings import Environment, settings
+
+# generated ids have digits, so collection names like resource-libraries are not taken for ids
+ID_PATTERN = re.compile(
+    r"^(\d+|[a-z]+-(?=[a-z]*\d)[a-z0-9]{9}|me|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$"
+)
+# collections of the LMS wrappers, see check_collections
+LMS_COLLECTIONS = ("activities", "resource-libraries", "activity-workflows", "objective-workflows")
+LMS_COMMAND_VERBS = ("create", "update", "delete", "start", "finish")
+LABS_PAGINATION_PARAMS = ("limit", "offset")
+LABS_IGNORED_PARAMS = ("limit", "offset", "search", "ordering")
+ORGANIZATION_ID = "org-local0000"
+ENV_PROVIDER = {"id": "env-local0000", "name": "Local", "type": "gce"}
+
+
+class FakeResponse(NamedTuple):
+    status: HTTPStatus
+    body: Any = None
+    headers: dict[str, str] = {}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _parse_body(body: bytes | str | None) -> dict | list:
+    if not body:
+        return {}
+    if isinstance(body, bytes):
+        body = body.decode(errors="replace")
+    try:
+        return json.loads(body)
+    except ValueError:
+        # form data of the token endpoint, multipart uploads are not parsed
+        return dict(parse_qsl(body)) if "=" in body and "\n" not in body else {}
+
+
+def _field_value(item: dict, selector: str) -> Any:
+    value: Any = item
+    parts = selector.split(".")
+    for index, part in enumerate(parts):
+        if not isinstance(value, dict):
+            return None
+        if part in value:
+            value = value[part]
+        elif (camel_part := part[:1].lower() + part[1:]) in value:
+            value = value[camel_part]
+        elif parts[index + 1 :] == ["id"] and f"{part}Id" in value:
+            # a nested entity is referenced by id in create payloads, e.g. objectiveId instead of objective.id
+            return value[f"{part}Id"]
+        else:
+            return None
+    return value
+
+
+def _compare(operation: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def compare(actual: Any, expected: Any) -> bool:
+        try:
+            return actual is not None and operation(actual, expected)
+        except TypeError:
+            return False
+
+    return compare
+
+
+FILTER_OPERATIONS: dict[str, Callable[[Any, Any], bool]] = {
+    "=": lambda actual, expected: actual == expected or str(actual) == str(expected),
+    "<>": lambda actual, expected: actual != expected and str(actual) != str(expected),
+    ">": _compare(lambda actual, expected: actual > expected),
+    ">=": _compare(lambda actual, expected: actual >= expected),
+    "<": _compare(lambda actual, expected: actual < expected),
+    "<=": _compare(lambda actual, expected: actual <= expected),
+    "startswith": lambda actual, expected: str(actual).lower().startswith(str(expected).lower()),
+    "endswith": lambda actual, expected: str(actual).lower().endswith(str(expected).lower()),
+    "contains": lambda actual, expected: str(expected).lower() in str(actual).lower(),
+    "notcontains": lambda actual, expected: str(expected).lower() not in str(actual).lower(),
+}
+
+
+def matches_filter(item: dict, descriptor: list) -> bool:
+    """Evaluates a LoadOptions FilterDescriptor, see core.models.query.LoadOptions"""
+    if not descriptor:
+        return True
+    if descriptor[0] == "!":
+        return not matches_filter(item, descriptor[1])
+    if isinstance(descriptor[0], list):
+        # [filter, binop, filter, ...], filters without a binop between them are joined with "and"
+        result, operator = True, "and"
+        for part in descriptor:
+            if isinstance(part, str):
+                operator = part.lower()
+                continue
+            value = matches_filter(item, part)
+            result = (result and value) if operator == "and" else (result or value)
+            operator = "and"
+        return result
+
+    column, operator, expected = descriptor if len(descriptor) == 3 else (descriptor[0], "=", descriptor[1])
+    return FILTER_OPERATIONS[operator.lower()](_field_value(item, column), expected)
+
+
+def apply_load_options(items: list[dict], params: dict[str, str]) -> dict[str, Any]:
+    """Answers a /query request with LoadOptions in query params"""
+    # LoadOptions.lms_dict lowercases requireTotalCount
+    params = {key.lower(): value for key, value in params.items()}
+    if params.get("filter"):
+        items = [item for item in items if matches_filter(item, json.loads(params["filter"]))]
+
+    if params.get("sort"):
+        try:
+            sort = json.loads(params["sort"])
+        except ValueError:
+            sort = params["sort"]
+        for descriptor in reversed(sort if isinstance(sort, list) else [sort]):
+            descriptor = {"selector": descriptor} if isinstance(descriptor, str) else descriptor
+            items = sorted(
+                items,
+                key=lambda item: ((value := _field_value(item, descriptor["selector"])) is None, str(value)),
+                reverse=bool(descriptor.get("desc")),
+            )
+
+    skip = int(params.get("skip") or 0)
+    take = int(params["take"]) if params.get("take") else None
+    page = items[skip : skip + take if take is not None else None]
+
+    result: dict[str, Any] = {"data": page}
+    if params.get("requiretotalcount", "").lower() == "true":
+        result["totalCount"] = len(items)
+    return result
+
+
+class _Route(NamedTuple):
+    collection: str
+    obj_id: str | None
+    rest: list[str]
+
+    @property
+    def is_query(self) -> bool:
+        return self.obj_id is None and self.collection.endswith("/query")
+
+    @property
+    def resource(self) -> str:
+        return self.collection.removesuffix("/query") if self.is_query else self.collection
+
+
+def _route(path: str) -> _Route:
+    """Splits a path into a collection, an object id and what follows the id, e.g. an action or a nested collection"""
+    segments = [segment for segment in path.split("/") if segment]
+    for index, segment in enumerate(segments):
+        if ID_PATTERN.match(segment):
+            return _Route("/".join(segments[:index]), segment, segments[index + 1 :])
+    return _Route("/".join(segments), None, [])
+
+
+class FakeStand:
+    """
+    In-memory backends of the local stand. All requests are handled one at a time under a lock.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = HTTPStatus.SERVICE_UNAVAILABLE,
+        command_failure_rate: float = 0.0,
+        transition_seconds: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        latency: seconds every response is delayed by
+        error_rate: a part of requests answered with error_status, identity requests are never failed
+        command_failure_rate: a part of LMS commands completed as failed
+        transition_seconds: seconds until a scheduled change of a resource state
+        seed: a seed of error injection
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.command_failure_rate = command_failure_rate
+        self.transition_seconds = transition_seconds
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._collections: defaultdict[str, dict[str, dict]] = defaultdict(dict)
+        self._ids = itertools.count(1)
+        self._scheduled: list[tuple[float, int, Callable[[], None]]] = []
+        self._tokens: dict[str, str] = {}
+
+    @property
+    def is_in_process(self) -> bool:
+        return settings.stand == Environment.LOCAL and settings.fake_stand_in_process
+
+    @property
+    def openid_configuration(self) -> dict[str, Any]:
+        return {"issuer": settings.base_url_identity, "token_endpoint": f"{settings.base_url_identity}connect/token"}
+
+    def install(self):
+        """The IdP configuration is requested outside of sessions, so it is set right away"""
+        # settings._idp_config is a cached property
+        settings.__dict__.setdefault("_idp_config", self.openid_configuration)
+
+    def reset(self):
+        with self._lock:
+            self._collections.clear()
+            self._scheduled.clear()
+            self._tokens.clear()
+
+    def send(self, request: PreparedRequest, adapter: BaseAdapter) -> Response:
+        response = self.handle(request.method, request.url, request.body, request.headers)
+        content = b"" if response.body is None else json.dumps(response.body).encode()
+        return CachedResponse(
+            stored_at=0,
+            status_code=response.status,
+            reason=HTTPStatus(response.status).phrase,
+            headers={"Content-Type": "application/json", **response.headers},
+            content=content,
+            encoding="utf-8",
+        ).to_response(request, adapter)
+
+    def handle(self, method: str, url: str, body: bytes | str | None, headers: Any) -> FakeResponse:
+        if self.latency:
+            time.sleep(self.latency)
+
+        scheme, netloc, path, query, _ = urlsplit(url)
+        # e.g. the labs login url is joined with an extra slash
+        url = f"{scheme}://{netloc}{re.sub(r'/{2,}', '/', path)}"
+        params = dict(parse_qsl(query, keep_blank_values=True))
+        backends: list[tuple[str, Callable[..., FakeResponse]]] = [
+            (settings.base_url_identity, self._handle_identity),
+            (settings.base_url_lms_api, self._handle_lms),
+            (settings.base_url_scorm_api, self._handle_generic),
+            (settings.base_url_platform_api, self._handle_platform),
+            (settings.base_url_labs, self._handle_labs),
+            (settings.base_url, self._handle_base),
+        ]
+
+        with self._lock:
+            self._apply_due_changes()
+            for base_url, handler in sorted(backends, key=lambda backend: len(backend[0]), reverse=True):
+                if not url.startswith(base_url):
+                    continue
+                if handler != self._handle_identity and self._random.random() < self.error_rate:
+                    return FakeResponse(self.error_status, {"detail": "injected error"})
+
+                response = handler(method, base_url, url[len(base_url) :], params, _parse_body(body), headers)
+                return self._conditional(method, response, headers)
+
+        return FakeResponse(HTTPStatus.NOT_FOUND, {"detail": f"{url} is not served by the fake stand"})
+
+    def _schedule(self, change: Callable[[], None]):
+        heapq.heappush(self._scheduled, (time.monotonic() + self.transition_seconds, next(self._ids), change))
+
+    def _apply_due_changes(self):
+        now = time.monotonic()
+        while self._scheduled and self._scheduled[0][0] <= now:
+            _, _, change = heapq.heappop(self._scheduled)
+            change()
+
+    @staticmethod
+    def _conditional(method: str, response: FakeResponse, headers: Any) -> FakeResponse:
+        if method != "GET" or response.status != HTTPStatus.OK:
+            return response
+        etag = f'"{hashlib.md5(json.dumps(response.body, sort_keys=True).encode()).hexdigest()}"'
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(HTTPStatus.NOT_MODIFIED, None, {"ETag": etag})
+        return FakeResponse(response.status, response.body, {**response.headers, "ETag": etag})
+
+    def _new_id(self, prefix: str = "") -> str:
+        if not prefix:
+            return str(uuid.uuid4())
+        return f"{prefix}-{next(self._ids):09d}"
+
+    # IdP and the stand root
+
+    def _handle_identity(self, method: str, base_url: str, path: str, params: dict, body: dict, headers: Any):
+        if path == ".well-known/openid-configuration":
+            return FakeResponse(HTTPStatus.OK, self.openid_configuration)
+        if path == "connect/token" and method == "POST":
+            token = uuid.uuid4().hex
+            self._tokens[token] = body.get("username") or body.get("client_id", "")
+            body = {"access_token": token, "token_type": "Bearer", "expires_in": int(settings.default_token_lifetime)}
+            return FakeResponse(HTTPStatus.OK, body)
+        return FakeResponse(HTTPStatus.NOT_FOUND, {"detail": "not found"})
+
+    def _handle_base(self, method: str, base_url: str, path: str, params: dict, body: dict, headers: Any):
+        if path == "oidc/login":
+            # no login form means the user is already authorized, see core.api.auth.emulate_login
+            return FakeResponse(HTTPStatus.OK, {"authorized": True})
+        return FakeResponse(HTTPStatus.NOT_FOUND, {"detail": "not found"})
+
+    # labs
+
+    def _handle_labs(self, method: str, base_url: str, path: str, params: dict, body: dict, headers: Any):
+        if path.strip("/") == "api/auth/login":
+            token = uuid.uuid4().hex
+            self._tokens[token] = body.get("username", "")
+            return FakeResponse(HTTPStatus.OK, {"token": token})
+
+        route = _route(path.removeprefix("api/"))
+        objects = self._collections[f"labs:{route.collection}"]
+        if route.obj_id is None:
+            if method == "GET":
+                return FakeResponse(HTTPStatus.OK, self._labs_list(base_url, path, list(objects.values()), params))
+            if method == "POST":
+                return FakeResponse(HTTPStatus.CREATED, self._labs_create(route.collection, body))
+            return FakeResponse(HTTPStatus.METHOD_NOT_ALLOWED, {"detail": method})
+
+        obj = objects.get(route.obj_id)
+        if obj is None:
+            return FakeResponse(HTTPStatus.NOT_FOUND, {"detail": "Not found."})
+        if route.rest:
+            return self._labs_action(method, route, obj, body)
+        if method == "GET":
+            return FakeResponse(HTTPStatus.OK, obj)
+        if method in ("PUT", "PATCH"):
+            obj.update(body, updated_at=_now())
+            return FakeResponse(HTTPStatus.OK, obj)
+        if method == "DELETE":
+            del objects[route.obj_id]
+            return FakeResponse(HTTPStatus.NO_CONTENT)
+        return FakeResponse(HTTPStatus.METHOD_NOT_ALLOWED, {"detail": method})
+
+    @staticmethod
+    def _labs_list(base_url: str, path: str, items: list[dict], params: dict) -> list[dict] | dict:
+        if search := params.get("search"):
+            items = [item for item in items if search.lower() in str(item.get("name", "")).lower()]
+        for key, value in params.items():
+            if key not in LABS_IGNORED_PARAMS:
+                items = [item for item in items if str(item.get(key)) == value]
+        if not any(param in params for param in LABS_PAGINATION_PARAMS):
+            return items
+
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or len(items) or 1)
+        has_next = offset + limit < len(items)
+        return {
+            "count": len(items),
+            "next": f"{base_url}{path}?limit={limit}&offset={offset + limit}" if has_next else None,
+            "previous": None,
+            "results": items[offset : offset + limit],
+        }
+
+    def _labs_create(self, collection: str, payload: dict) -> dict:
+        payload = {key: value for key, value in payload.items() if value is not None}
+        factory = LABS_DEFAULTS.get(collection)
+        obj_id = self._new_id(LABS_ID_PREFIXES[collection]) if collection in LABS_ID_PREFIXES else next(self._ids)
+        now = _now()
+        obj = {"id": obj_id, "created_at": now, "updated_at": now}
+        obj.update(factory(self, obj_id, payload) if factory else {})
+        obj.update(payload)
+        self._collections[f"labs:{collection}"][str(obj_id)] = obj
+
+        if collection == "images":
+            self._schedule(lambda: obj.update(is_ready=True))
+        elif collection == "vms":
+            self._schedule(lambda: obj.update(status="running"))
+        return obj
+
+    def _labs_action(self, method: str, route: _Route, obj: dict, body: dict) -> FakeResponse:
+        action, *rest = route.rest
+        if route.collection == "sessions" and method == "POST" and action in SESSION_ACTIONS:
+            SESSION_ACTIONS[action](self, obj)
+            return FakeResponse(HTTPStatus.OK, obj)
+        if action in ("publish", "unpublish"):
+            obj.update(status="published" if action == "publish" else "draft", publish_updated_at=_now())
+            return FakeResponse(HTTPStatus.OK, obj)
+        if action == "clone":
+            payload = {key: value for key, value in obj.items() if key not in ("id", "created_at", "updated_at")}
+            return FakeResponse(HTTPStatus.CREATED, self._labs_create(route.collection, payload))
+        if action == "save" and route.collection == "vms":
+            image = {key: value for key, value in obj["image"].items() if key not in ("id", "env_provider")}
+            return FakeResponse(HTTPStatus.CREATED, self._labs_create("images", {**image, **body}))
+
+        # nested collections: GET tasks of a lab, POST a task to a lab, reorder or move tasks and steps
+        child_collection = f"{route.collection}/{action}"
+        if child_collection not in LABS_DEFAULTS and f"labs:{child_collection}" not in self._collections:
+            return FakeResponse(HTTPStatus.OK, obj)
+        children = self._collections[f"labs:{child_collection}"]
+        linked_ids = obj.setdefault(action, [])
+        if method == "GET" and not rest:
+            linked = [children[str(child_id)] for child_id in linked_ids if str(child_id) in children]
+            return FakeResponse(HTTPStatus.OK, [self._link_view(child, linked_ids) for child in linked])
+        if method == "POST" and len(rest) == 1 and rest[0] in children:
+            child = children[rest[0]]
+            if child["id"] not in linked_ids:
+                linked_ids.append(child["id"])
+                child.setdefault(route.collection.split("/")[-1], []).append(obj["id"])
+            return FakeResponse(HTTPStatus.CREATED, self._link_view(child, linked_ids))
+        if rest and rest[0] in children:
+            child = children[rest[0]]
+            if action_name := rest[1:2]:
+                if action_name == ["move"] and child["id"] in linked_ids:
+                    linked_ids.remove(child["id"])
+                    linked_ids.insert(int(body.get("order", 0)), child["id"])
+            elif method == "DELETE":
+                if child["id"] in linked_ids:
+                    linked_ids.remove(child["id"])
+                return FakeResponse(HTTPStatus.NO_CONTENT)
+            return FakeResponse(HTTPStatus.OK, self._link_view(child, linked_ids))
+        return FakeResponse(HTTPStatus.OK, obj)
+
+    @staticmethod
+    def _link_view(child: dict, linked_ids: list) -> dict:
+        view = {"order": linked_ids.index(child["id"]), "is_content_only": False, "variables_ready": True, **child}
+        if isinstance(view.get("acceptance_criteria"), list) and not view["acceptance_criteria"]:
+            # a task in a lab has a single criteria object
+            view["acceptance_criteria"] = None if "labs" in child else []
+        return view
+
+    # LMS
+
+    def _handle_lms(self, method: str, base_url: str, path: str, params: dict, body: dict, headers: Any):
+        route = _route(path)
+        verb, _, path_name = route.collection.partition("-")
+        if verb in LMS_COMMAND_VERBS and path_name:
+            return self._lms_command(method, route, body)
+
+        entities = self._collections[f"lms:{route.resource}"]
+        if route.obj_id is None and method == "POST" and not route.is_query:
+            entity_id = body.get("id") or self._new_id()
+            entity = {**body, "id": entity_id}
+            return self._submit_command(
+                CommandKey("create", route.collection), entity_id, lambda: entities.__setitem__(entity_id, entity)
+            )
+        if route.obj_id is not None and method in ("PUT", "DELETE"):
+            entity = entities.get(route.obj_id)
+            if entity is None:
+                return FakeResponse(HTTPStatus.NOT_FOUND, {"detail": "not found"})
+            if method == "PUT":
+                return self._submit_command(
+                    CommandKey("update", route.collection), route.obj_id, lambda: entity.update(body)
+                )
+            return self._submit_command(
+                CommandKey("delete", route.collection), route.obj_id, lambda: entities.pop(route.obj_id, None)
+            )
+        return self._handle_collection(method, route, entities, params, body)
+
+    def _lms_command(self, method: str, route: _Route, body: dict) -> FakeResponse:
+        verb, _, path_name = route.collection.partition("-")
+        commands = self._collections[f"lms:{route.collection}"]
+        if method == "POST" and route.obj_id is None:
+            # workflow commands, e.g. start-activity-workflows
+            return self._submit_command(CommandKey(verb, path_name), body.get("id") or self._new_id(), lambda: None)
+        if method != "GET":
+            return FakeResponse(HTTPStatus.METHOD_NOT_ALLOWED, {"detail": method})
+        if route.obj_id is None:
+            return FakeResponse(HTTPStatus.OK, list(commands.values()))
+        if route.obj_id not in commands:
+            return FakeResponse(HTTPStatus.NOT_FOUND, {"detail": "not found"})
+        return FakeResponse(HTTPStatus.OK, commands[route.obj_id])
+
+    def _submit_command(self, key: "CommandKey", entity_id: str, change: Callable[[], None]) -> FakeResponse:
+        command_id = self._new_id()
+        command = {"id": command_id, "entityId": entity_id, "created": _now(), "completed": None}
+        self._collections[f"lms:{key.collection}"][command_id] = command
+        is_failed = self._random.random() < self.command_failure_rate
+
+        def complete():
+            if not is_failed:
+                change()
+            command["completed"] = {
+                "url": f"{settings.base_url_lms_api}{key.path_name}/{entity_id}",
+                "completed": _now(),
+                "state": 2 if is_failed else 1,
+                "errors": {"command": ["injected failure"]} if is_failed else None,
+            }
+
+        self._schedule(complete)
+        operation = {
+            "id": command_id,
+            "url": f"{settings.base_url_lms_api}{key.collection}/{command_id}",
+            "message": "Accepted",
+        }
+        return FakeResponse(HTTPStatus.ACCEPTED, operation)
+
+    # SCORM and platform
+
+    def _handle_platform(self, method: str, base_url: str, path: str, params: dict, body: dict, headers: Any):
+        route = _route(path)
+        if route == _Route("users", "me", []) and method == "GET":
+            return FakeResponse(HTTPStatus.OK, self._current_user(headers))
+
+        response = self._handle_generic(method, base_url, path, params, body, headers)
+        if route.collection == "users" and method == "POST" and response.status == HTTPStatus.OK:
+            response.body.update({**PLATFORM_USER_DEFAULTS, **response.body, "tenant_id": _tenant_id()})
+        if method == "GET" and isinstance(response.body, list):
+            return FakeResponse(
+                response.status, {"items": response.body, "pagination": {"has_next": False, "next_page": ""}}
+            )
+        return response
+
+    def _current_user(self, headers: Any) -> dict:
+        token = headers.get("Authorization", "").rpartition(" ")[2]
+        username = self._tokens.get(token) or "local"
+        return {
+            **PLATFORM_USER_DEFAULTS,
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, username)),
+            "username": username,
+            "email": username if "@" in username else f"{username}@localhost",
+            "tenant_id": _tenant_id(),
+        }
+
+    def _handle_generic(self, method: str, base_url: str, path: str, params: dict, body: dict, headers: Any):
+        route = _route(path)
+        entities = self._collections[f"{base_url}{route.resource}"]
+        return self._handle_collection(method, route, entities, params, body)
+
+    def _handle_collection(
+        self, method: str, route: _Route, entities: dict[str, dict], params: dict, body: dict
+    ) -> FakeResponse:
+        if route.obj_id is None:
+            if route.is_query:
+                return FakeResponse(HTTPStatus.OK, apply_load_options(list(entities.values()), params))
+            if method == "GET":
+                return FakeResponse(HTTPStatus.OK, list(entities.values()))
+            if method == "POST":
+                entity = {**body, "id": body.get("id") or self._new_id()}
+                entities[entity["id"]] = entity
+                return FakeResponse(HTTPStatus.OK, entity)
+            return FakeResponse(HTTPStatus.METHOD_NOT_ALLOWED, {"detail": method})
+
+        entity = entities.get(route.obj_id)
+        if route.rest:
+            # sub-resources, e.g. personal enrollments of an objective, are not modelled
+            if route.rest[-1] == "query":
+                return FakeResponse(HTTPStatus.OK, apply_load_options([], params))
+            return FakeResponse(HTTPStatus.OK, [])
+        if entity is None:
+            return FakeResponse(HTTPStatus.NOT_FOUND, {"detail": "not found"})
+        if method == "GET":
+            return FakeResponse(HTTPStatus.OK, entity)
+        if method in ("PUT", "PATCH"):
+            entity.update(body)
+            return FakeResponse(HTTPStatus.OK, entity)
+        if method == "DELETE":
+            del entities[route.obj_id]
+            return FakeResponse(HTTPStatus.NO_CONTENT)
+        return FakeResponse(HTTPStatus.METHOD_NOT_ALLOWED, {"detail": method})
+
+
+class CommandKey(NamedTuple):
+    verb: str
+    path_name: str
+
+    @property
+    def collection(self) -> str:
+        return f"{self.verb}-{self.path_name}"
+
+
+def _tenant_id() -> str:
+    return settings.stand_config.tenant_id
+
+
+def _lab_defaults(stand: FakeStand, obj_id: int, payload: dict) -> dict:
+    return {
+        "code": f"LAB{obj_id}",
+        "created_by": {"id": 1},
+        "default_language": "en",
+        "default_type": "virtual_machine",
+        "edit_url": f"{settings.base_url_labs}labs/{obj_id}/edit",
+        "logo_link": "",
+        "lti_1p3_url": f"{settings.base_url_labs}lti/1p3/{obj_id}",
+        "lti_object_id": obj_id,
+        "lti_url": f"{settings.base_url_labs}lti/{obj_id}",
+        "organization": ORGANIZATION_ID,
+        "status": "draft",
+        "tasks": [],
+        "workspace_configuration": stand._new_id("wcfg"),
+    }
+
+
+def _task_defaults(stand: FakeStand, obj_id: int, payload: dict) -> dict:
+    return {"acceptance_criteria": [], "data": {}, "steps": [], "labs": [], "level": 0}
+
+
+def _step_defaults(stand: FakeStand, obj_id: int, payload: dict) -> dict:
+    return {
+        "data": {},
+        "tasks": [],
+        "suggested_inputs": [],
+        "hints": [],
+        "acceptance_criteria": [],
+        "is_virtual": False,
+        "translation_language": None,
+        "translations": None,
+        "translation_coverage": None,
+    }
+
+
+def _workspace_configuration_defaults(stand: FakeStand, obj_id: str, payload: dict) -> dict:
+    return {"configuration_items": [], "created_by": 1, "last_used_at": _now(), "organization": ORGANIZATION_ID}
+
+
+def _session_defaults(stand: FakeStand, obj_id: str, payload: dict) -> dict:
+    lab = stand._collections["labs:labs"].get(str(payload.get("lab_id")), {})
+    now = _now()
+    return {
+        "lab": {"id": str(payload.get("lab_id")), "name": lab.get("name", "")},
+        "user": {},
+        "workspace": {
+            "id": stand._new_id("wsp"),
+            "status": "prepared",
+            "created_at": now,
+            "updated_at": now,
+            "user": {},
+            "vms": {},
+            "projects": {},
+            "jupyter": {},
+        },
+        "state": "prepared",
+        "started_at": None,
+        "finished_at": None,
+        "ready_at": None,
+        "lab_type": lab.get("default_type"),
+        "meta": {},
+        "is_service": True,
+    }
+
+
+def _image_defaults(stand: FakeStand, obj_id: str, payload: dict) -> dict:
+    return {
+        "system_status": "active",
+        "type": "custom",
+        "provider": "gce",
+        "system": "linux",
+        "os_type": "Linux",
+        "os_version": "Ubuntu 20.04",
+        "description": "",
+        "software": "",
+        "is_ready": False,
+        "external_id": None,
+        "deleted": False,
+        "organization": ORGANIZATION_ID,
+        "used_labs_count": 0,
+        "env_provider": ENV_PROVIDER,
+    }
+
+
+def _vm_defaults(stand: FakeStand, obj_id: str, payload: dict) -> dict:
+    image = stand._collections["labs:images"].get(str(payload.get("image_id")))
+    if image is None:
+        # a base image of the stand
+        now = _now()
+        image = {
+            "id": payload.get("image_id"),
+            "created_at": now,
+            "updated_at": now,
+            **_image_defaults(stand, "", {}),
+            "name": "base",
+            "type": "base",
+            "is_ready": True,
+        }
+    return {
+        "image": {**image, "env_provider": image["env_provider"]["id"], "container_envs": {}, "options": {}},
+        "organization": ORGANIZATION_ID,
+        "provider": "gce",
+        "region": "none",
+        "status": "pending",
+        "ip": None,
+        "private_ips": [],
+        "ips": [],
+        "component": None,
+        "sessions": None,
+    }
+
+
+LABS_DEFAULTS: dict[str, Callable[[FakeStand, Any, dict], dict]] = {
+    "labs": _lab_defaults,
+    "labs/tasks": _task_defaults,
+    "labs/tasks/steps": _step_defaults,
+    "workspace/configuration": _workspace_configuration_defaults,
+    "sessions": _session_defaults,
+    "images": _image_defaults,
+    "vms": _vm_defaults,
+}
+LABS_ID_PREFIXES = {"workspace/configuration": "wcfg", "sessions": "ses", "images": "img", "vms": "vm"}
+
+
+def _start_session(stand: FakeStand, session: dict):
+    def activate():
+        if session["state"] == "prepared":
+            now = _now()
+            session.update(state="active", started_at=now, ready_at=now, updated_at=now)
+            session["workspace"]["status"] = "ready"
+
+    stand._schedule(activate)
+
+
+def _finish_session(stand: FakeStand, session: dict):
+    stand._schedule(lambda: session.update(state="finished", finished_at=_now(), updated_at=_now()))
+
+
+SESSION_ACTIONS: dict[str, Callable[[FakeStand, dict], None]] = {
+    "start": _start_session,
+    "pause": lambda stand, session: session.update(state="paused", updated_at=_now()),
+    "resume": lambda stand, session: session.update(state="active", updated_at=_now()),
+    "finish": _finish_session,
+    "reset": lambda stand, session: session.update(updated_at=_now()),
+}
+
+PLATFORM_USER_DEFAULTS = {"first_name": "Local", "last_name": "User", "is_blocked": False, "status": "Active"}
+
+
+fake_stand = FakeStand(
+    latency=settings.fake_stand_latency,
+    error_rate=settings.fake_stand_error_rate,
+    error_status=settings.fake_stand_error_status,
+    command_failure_rate=settings.fake_stand_command_failure_rate,
+    transition_seconds=settings.fake_stand_transition_seconds,
+    seed=settings.fake_stand_seed,
+)
+
+
+class FakeStandRequestHandler(BaseHTTPRequestHandler):
+    def _handle(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        url = f"http://{self.headers['Host']}{self.path}"
+        response = fake_stand.handle(self.command, url, body, self.headers)
+        content = b"" if response.body is None else json.dumps(response.body).encode()
+
+        self.send_response(response.status)
+        for name, value in {"Content-Type": "application/json", **response.headers}.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format: str, *args):
+        logging.debug(format % args)
+
+
+def check_collections() -> list[str]:
+    """Posts to every LMS collection of the wrappers and returns the ones the fake stand doesn't accept"""
+    stand = FakeStand(seed=settings.fake_stand_seed)
+    failed = []
+    for collection in LMS_COLLECTIONS:
+        response = stand.handle("POST", f"{settings.base_url_lms_api}{collection}", b"{}", {})
+        if response.status != HTTPStatus.ACCEPTED:
+            failed.append(f"POST {collection}: {response.status} {response.body}")
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="The fake of the local stand")
+    parser.add_argument("--check", action="store_true", help="check the collections of the wrappers and exit")
+    args = parser.parse_args()
+    if args.check:
+        failures = check_collections()
+        print("\n".join(failures) or "all collections are accepted")
+        raise SystemExit(1 if failures else 0)
+
+    address = urlsplit(settings.base_url)
+    server = ThreadingHTTPServer((address.hostname, address.port or 80), FakeStandRequestHandler)
+    print(f"serving the fake stand on {settings.base_url}")
+    server.serve_forever()
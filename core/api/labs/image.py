@@ -1,12 +1,12 @@
 import allure
 import requests
-from waiting import wait
 
 from core.api.base_refactored.api_client import ManagerApiClient, SingleItemApiClient
 from core.api.base_refactored.api_wrapper import QueryablesManager
 from core.api.labs.base import LabsCommonObjectWrapper
 from core.models.labs.image import ExternalImage, ExternalImageInput
 from settings import settings
+from util.polling import Poller
 
 
 class ImageClient(SingleItemApiClient):
@@ -27,19 +27,16 @@ class ImageWrapper(LabsCommonObjectWrapper[ImageClient, ExternalImage, ExternalI
         """
         Wait until the image is ready
         """
+        poller = Poller("image is ready", timeout_seconds=timeout)
 
         def poll_get_image():
-            res = self.api.request_get()
-            return res if res.json()["is_ready"] else None
+            res = self.api.request_get(headers=self.conditional_headers)
+            poller.honor_retry_after(res)
+            self._update_from_get(res)
+            return res if self.data.is_ready else None
 
         with allure.step(f"Waiting until {self} will be ready"):
-            response = wait(
-                poll_get_image,
-                waiting_for=f"until {self} will be ready",
-                timeout_seconds=timeout,
-            )
-        self._update_inner_data(response)
-        return response
+            return poller.wait(poll_get_image, waiting_for=f"until {self} will be ready")
 
 
 class ImagesManagerClient(ManagerApiClient):
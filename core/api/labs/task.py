@@ -1,5 +1,5 @@
 from functools import cached_property
-from typing import Self
+from typing import Iterable, Self
 
 import allure
 import requests
@@ -117,6 +117,11 @@ class TasksManager(LabsCommonManager[TasksManagerClient, TaskWrapper, Translated
     def create_task_with_name(self, task_name: str) -> TaskWrapper:
         return self.create(TranslatedTaskInput(name=task_name))
 
+    def create_tasks(
+        self, input_data_models: Iterable[TranslatedTaskInput | None], teardown_bucket: list
+    ) -> list[TaskWrapper]:
+        return self.create_many(input_data_models, teardown_bucket=teardown_bucket)
+
 
 class TasksInLabManagerClient(ApiClient):
     URL_TEMPLATE = f"{settings.base_url_labs}api/labs/{{lab_id}}/tasks/"
@@ -7,9 +7,9 @@ from http import HTTPStatus
 from time import time
 
 import allure
-from pydantic import parse_raw_as
 from requests import Response
 
+from core.api.decoding import parse_response
 from core.api.lms.base import LMSApiObject, LMSApiObjectManager, LmsAsyncApi
 from core.api.lms.resource_library import ResourceLibrary
 from core.models.lms.activity import Activity as ActivityModel
@@ -40,7 +40,7 @@ class ActivityApi(LmsAsyncApi[ActivityModel, CreateActivity, UpdateActivity]):
             response = self.request_get_parts(obj_id)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(list[ActivityPartModel], response.text)
+            return parse_response(response, list[ActivityPartModel])
 
 
 class Activity(LMSApiObject[ActivityModel, ActivityApi]):
@@ -1,5 +1,4 @@
 import allure
-from waiting import wait
 
 from core.api.lms.base import LMSApiObject, LMSApiObjectManager
 from core.api.lms.base_api import LmsAsyncApi
@@ -8,6 +7,7 @@ from core.models.lms.activity_workflow_aggregate import FinishActivityWorkflow,
 from core.models.lms.lms_base import LMSHasKey, LMSMayHasKey
 from core.models.lms.objective_workflow_aggregate import ObjectiveWorkflow, WorkflowState
 from settings import settings
+from util.polling import wait_for
 
 
 class ActivityWorkflowApi(LmsAsyncApi[ActivityWorkflowModel, LMSMayHasKey, LMSHasKey]):
@@ -34,11 +34,12 @@ class ActivityWorkflow(LMSApiObject[ActivityWorkflowModel, ActivityWorkflowApi])
 
     def wait_for_activity_workflow_to_finish(self):
         with allure.step(f"Waiting for activity workflow ID={self.data.id} to finish"):
-            return wait(
+            return wait_for(
                 lambda: self.data.state == WorkflowState.FINISHED,
+                operation="activity workflow finish",
                 on_poll=self.sync,
                 timeout_seconds=settings.default_command_timeout,
-                sleep_seconds=settings.default_command_sleep,
+                min_delay=settings.default_command_sleep,
                 waiting_for=f"Activity workflow ID={self.data.id} to finish",
             )
 
@@ -1,11 +1,10 @@
-from waiting import wait
-
 from core.api.lms.base import LMSApiObject, LMSApiObjectManager
 from core.api.lms.base_api import LmsAsyncApi
 from core.models.lms.activity_workflow_aggregate import ActivityWorkflowAggregate as ActivityWorkflowAggregateModel
 from core.models.lms.lms_base import LMSHasKey, LMSMayHasKey
 from core.models.query import LoadOptions
 from settings import settings
+from util.polling import wait_for
 
 
 class ActivityWorkflowAggregateApi(LmsAsyncApi[ActivityWorkflowAggregateModel, LMSHasKey, LMSMayHasKey]):
@@ -24,10 +23,11 @@ class ActivityWorkflowAggregateFactory(LMSApiObjectManager[ActivityWorkflowAggre
     OBJECT = ActivityWorkflowAggregate
 
     def wait_for_activity(self, activity_id: str):
-        return wait(
+        return wait_for(
             lambda: self.query(load_options=LoadOptions(filter=f'["activity.id","=","{activity_id}"]')),
+            operation="activity workflow aggregate appearance",
             timeout_seconds=settings.default_command_timeout,
-            sleep_seconds=settings.default_command_sleep,
+            min_delay=settings.default_command_sleep,
             waiting_for=f"Activity workflow aggregate to appear for activity with id {activity_id}",
         )
 
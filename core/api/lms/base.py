@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar
+from typing import Generic, Iterator, TypeVar
 
 from core.api.base import ApiObject, ApiObjectManager, DeletableApiObject, UpdatableApiObject
 from core.api.base_api import ApiModel
@@ -24,6 +24,12 @@ class LMSApiObjectManager(ApiObjectManager[LMSApiType, LMSObjectType]):
     API: type[LMSApiType]
     OBJECT: type[LMSObjectType]
 
-    def query(self, load_options: LoadOptions) -> list[LMSObjectType]:
-        query_response = self._api.query(load_options)
+    def query(self, load_options: LoadOptions, trusted: bool = False) -> list[LMSObjectType]:
+        query_response = self._api.query(load_options, trusted=trusted)
         return [self.OBJECT(self.session, data) for data in query_response.data]
+
+    def iter_query(
+        self, load_options: LoadOptions, page_size: int = 100, trusted: bool = False
+    ) -> Iterator[LMSObjectType]:
+        for data in self._api.iter_query(load_options, page_size=page_size, trusted=trusted):
+            yield self.OBJECT(self.session, data)
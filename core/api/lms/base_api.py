@@ -3,9 +3,7 @@ from http import HTTPStatus
 from typing import ClassVar, Generic
 
 import allure
-from pydantic import parse_raw_as
 from requests import Response
-from waiting import wait
 from waiting.exceptions import TimeoutExpired
 
 from core.api.base_api import (
@@ -20,10 +18,12 @@ from core.api.base_api import (
     check_response,
     prepare_body,
 )
+from core.api.decoding import parse_response
 from core.models.lms.command import Command, Operation
 from core.models.lms.lms_base import LMSModelBase
 from settings import settings
 from util.assertions.common_assertions import assert_response_status
+from util.polling import Poller
 
 
 class CommandType(StrEnum):
@@ -84,14 +84,14 @@ class LmsAsyncApi(
             response = self.request_get_cmd(cmd_type, cmd_id)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(Command, response.text)
+            return parse_response(response, Command)
 
     def list_cmd(self, cmd_type: CommandType) -> list[Command]:
         with allure.step(f"Get all {self.PATH_NAME} commands"):
             response = self.request_list_cmd(cmd_type)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(list[Command], response.text)
+            return parse_response(response, list[Command])
 
     def wait_for_operation(self, operation: Operation) -> Command:
         with allure.step(f"Waiting for opearion {operation.id} to finish"):
@@ -117,20 +117,22 @@ class LmsAsyncApi(
             return command
 
     def _wait_for_completion(self, url: str) -> Command:
+        poller = Poller(
+            f"{self.PATH_NAME} command",
+            timeout_seconds=settings.default_command_timeout,
+            max_delay=settings.default_command_sleep,
+        )
+
         def wait_condition():
             response = self.session.get(url)
+            poller.honor_retry_after(response)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            command = parse_raw_as(Command, response.text)
+            command = parse_response(response, Command)
 
             return command if command.is_completed() else None
 
-        return wait(
-            lambda: wait_condition(),
-            timeout_seconds=settings.default_command_timeout,
-            sleep_seconds=settings.default_command_sleep,
-            waiting_for=f"Command {url} to finish",
-        )
+        return poller.wait(wait_condition, waiting_for=f"Command {url} to finish")
 
     def _send_async_request(self, url: str, payload: LMSModelBase) -> Command:
         response = self.session.post(
@@ -142,14 +144,14 @@ class LmsAsyncApi(
 
         # Workaround: operation returns url scheme behind api gateway
         # See https://youtrack.constr.dev/issue/ALMS-4371 for more information
-        operation = Operation.parse_raw(response.text)
+        operation = parse_response(response, Operation)
         operation_url = f"{url}/{operation.id}"
         return self._wait_for_completion(operation_url)
 
     def _process_async_response(self, response: Response, command_type: CommandType) -> Command:
         check_response(response, HTTPStatus.ACCEPTED)
 
-        operation = Operation.parse_raw(response.text)
+        operation = parse_response(response, Operation)
 
         command = self.get_cmd(cmd_type=command_type, cmd_id=operation.url.split("/")[-1])
         return self.wait_for_command(command, command_type)
@@ -1,9 +1,9 @@
 from http import HTTPStatus
 
 import allure
-from pydantic import parse_raw_as
 from requests import Response
 
+from core.api.decoding import parse_response
 from core.api.lms.base import LMSApiObject, LMSApiObjectManager
 from core.api.lms.base_api import LmsAsyncApi
 from core.models.lms.activity import Activity
@@ -31,7 +31,7 @@ class ObjectiveApi(LmsAsyncApi[ObjectiveModel, CreateObjective, UpdateObjective]
             response = self.request_get_personal_enrollments(obj_id)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(list[PersonalEnrollment], response.text)
+            return parse_response(response, list[PersonalEnrollment])
 
     def request_query_personal_enrollments(self, obj_id: str, load_options: LoadOptions) -> Response:
         return self.session.get(
@@ -43,7 +43,7 @@ class ObjectiveApi(LmsAsyncApi[ObjectiveModel, CreateObjective, UpdateObjective]
             response = self.request_query_personal_enrollments(obj_id, load_options)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(list[PersonalEnrollment], response.text)
+            return parse_response(response, list[PersonalEnrollment])
 
 
 # TODO: group enrollments, org unit enrollments, records, accesses, workflow aggregates
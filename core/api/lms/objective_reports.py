@@ -2,9 +2,9 @@ from http import HTTPStatus
 
 import allure
 from assertpy import assert_that
-from pydantic import parse_raw_as
 from requests import Response
 
+from core.api.decoding import parse_response
 from core.api.lms.base import LMSApiObject, LMSApiObjectManager
 from core.api.lms.base_api import LmsAsyncApi
 from core.models.lms.lms_base import LMSHasKey, LMSMayHasKey
@@ -32,7 +32,7 @@ class ObjectiveReportsApi(LmsAsyncApi[ObjectiveReportsModel, LMSMayHasKey, LMSHa
             response = self.request_get_activity_part_reports_from_objective_report(obj_id)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            activity_part_reports = parse_raw_as(QueryResponse[ActivityPartReportModel], response.text)
+            activity_part_reports = parse_response(response, QueryResponse[ActivityPartReportModel])
             assert_that(activity_part_reports.data).is_length(expected_size)
 
             return activity_part_reports
@@ -2,9 +2,9 @@ from http import HTTPStatus
 
 import allure
 from requests import Response
-from waiting import wait
 
 from core.api.base_api import prepare_body
+from core.api.decoding import parse_response
 from core.api.lms.base import LMSApiObject, LMSApiObjectManager
 from core.api.lms.base_api import LmsAsyncApi
 from core.models.lms.lms_base import LMSHasKey, LMSMayHasKey
@@ -18,6 +18,7 @@ from core.models.lms.objective_workflow_aggregate import (
 from core.models.lti.lti_resource_library import LtiResourceInitModel, LtiResourceLinkModel
 from settings import settings
 from util.assertions.common_assertions import assert_response_status
+from util.polling import wait_for
 
 
 class ObjectiveWorkflowApi(LmsAsyncApi[ObjectiveWorkflowModel, LMSMayHasKey, LMSHasKey]):
@@ -47,7 +48,7 @@ class ObjectiveWorkflowApi(LmsAsyncApi[ObjectiveWorkflowModel, LMSMayHasKey, LMS
             response = self.request_get_lti_form(payload, obj_id)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return LtiResourceInitModel.parse_raw(response.text)
+            return parse_response(response, LtiResourceInitModel)
 
 
 class ObjectiveWorkflow(LMSApiObject[ObjectiveWorkflowModel, ObjectiveWorkflowApi]):
@@ -55,13 +56,14 @@ class ObjectiveWorkflow(LMSApiObject[ObjectiveWorkflowModel, ObjectiveWorkflowAp
 
     def wait_for_objective_workflow_to_finish(self):
         with allure.step(f"Waiting for objective workflow ID={self.data.id} to finish"):
-            return wait(
+            return wait_for(
                 lambda: self.data.state == WorkflowState.FINISHED,
+                operation="objective workflow finish",
                 on_poll=self.sync,
                 # TODO: remove multiplication after fix of
                 #  https://youtrack.constr.dev/issue/ALMS-5740/Finish-composite-workflow-synchronously-for-LTI-children
                 timeout_seconds=settings.default_command_timeout * 2,
-                sleep_seconds=settings.default_command_sleep,
+                min_delay=settings.default_command_sleep,
                 waiting_for=f"Objective workflow ID={self.data.id} to finish",
             )
 
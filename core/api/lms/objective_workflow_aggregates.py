@@ -2,10 +2,9 @@ from http import HTTPStatus
 from typing import List
 
 import allure
-from pydantic import parse_raw_as
 from requests import Response
-from waiting import wait
 
+from core.api.decoding import parse_response
 from core.api.lms.base import LMSApiObject, LMSApiObjectManager
 from core.api.lms.base_api import LmsAsyncApi
 from core.models.lms.activity_workflow_aggregate import ActivityByObjectiveWorkflowAndAxis, ActivityWithAggregate
@@ -15,6 +14,7 @@ from core.models.lms.objective_workflow_aggregate import ObjectiveWorkflowAggreg
 from core.models.query import LoadOptions
 from settings import settings
 from util.assertions.common_assertions import assert_response_status
+from util.polling import wait_for
 
 
 # Looks like this API is not fully functional
@@ -35,11 +35,12 @@ class ObjectiveWorkflowAggregate(LMSApiObject[ObjectiveWorkflowAggregateModel, O
             self.sync()
             return self.data.last_objective_workflow.progress > initial_progress
 
-        return wait(
+        return wait_for(
             condition_function,
+            operation="objective workflow progress update",
             timeout_seconds=settings.default_command_timeout,
-            sleep_seconds=settings.default_command_sleep,
             waiting_for="Objective workflow progress to be updated",
+            min_delay=settings.default_command_sleep,
         )
 
     def request_get_activity_with_aggregates(self) -> Response:
@@ -50,7 +51,7 @@ class ObjectiveWorkflowAggregate(LMSApiObject[ObjectiveWorkflowAggregateModel, O
             response = self.request_get_activity_with_aggregates()
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(ActivityWithAggregate, response.text)
+            return parse_response(response, ActivityWithAggregate)
 
     def request_get_activity_by_owa_axis(self, axis: str) -> Response:
         return self._api.session.get(f"{self._api.get_instance_url(self.data.id)}/activity/{axis}")
@@ -60,14 +61,14 @@ class ObjectiveWorkflowAggregate(LMSApiObject[ObjectiveWorkflowAggregateModel, O
             response = self.request_get_activity_by_owa_axis(axis)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(ActivityByObjectiveWorkflowAndAxis, response.text)
+            return parse_response(response, ActivityByObjectiveWorkflowAndAxis)
 
     def get_objective_records(self) -> List[ObjectiveRecord]:
         with allure.step(f"Get objective records for objective workflow aggregate ID: {self.data.id}"):
             response = self.request_get_objective_records()
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(List[ObjectiveRecord], response.text)
+            return parse_response(response, List[ObjectiveRecord])
 
     def request_get_objective_records(self) -> List[ObjectiveRecord]:
         return self.session.get(f"{self._api.get_instance_url(self.data.id)}/objective-records")
@@ -78,9 +79,10 @@ class ObjectiveWorkflowAggregateFactory(LMSApiObjectManager[ObjectiveWorkflowAgg
     OBJECT = ObjectiveWorkflowAggregate
 
     def wait_for_objective(self, objective_id: str):
-        return wait(
+        return wait_for(
             lambda: self.query(load_options=LoadOptions(filter=f'["objective.id","=","{objective_id}"]')),
+            operation="objective workflow aggregate appearance",
             timeout_seconds=settings.default_command_timeout,
-            sleep_seconds=settings.default_command_sleep,
+            min_delay=settings.default_command_sleep,
             waiting_for=f"Objective workflow aggregate to appear for objective with id {objective_id}",
         )
@@ -1,9 +1,9 @@
 from http import HTTPStatus
 
 import allure
-from pydantic import parse_raw_as
 from requests import Response
 
+from core.api.decoding import parse_response
 from core.api.lms.base import LMSApiObject, LMSApiObjectManager
 from core.api.lms.base_api import LmsAsyncApi
 from core.models.lms.resource_library import CreateResourceLibrary, Resource
@@ -29,7 +29,7 @@ class ResourceLibraryApi(LmsAsyncApi[ResourceLibraryModel, CreateResourceLibrary
         with allure.step(f"Get actions for {obj_id} resource library"):
             response = self.request_get_actions(obj_id)
             assert_response_status(response.status_code, HTTPStatus.OK)
-            return parse_raw_as(list[ResourceLibraryAction], response.text)
+            return parse_response(response, list[ResourceLibraryAction])
 
     def request_get_resources(self, obj_id: str) -> Response:
         return self.session.get(f"{self.get_instance_url(obj_id)}/resources")
@@ -39,7 +39,7 @@ class ResourceLibraryApi(LmsAsyncApi[ResourceLibraryModel, CreateResourceLibrary
             response = self.request_get_resources(obj_id)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(list[Resource], response.text)
+            return parse_response(response, list[Resource])
 
     def request_get_resource(self, obj_id: str, resource_path: str):
         return self.session.get(f"{self.get_instance_url(obj_id)}/resources/{resource_path}")
@@ -49,7 +49,7 @@ class ResourceLibraryApi(LmsAsyncApi[ResourceLibraryModel, CreateResourceLibrary
             response = self.request_get_resource(obj_id, resource_path)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return parse_raw_as(list[Resource], response.text)
+            return parse_response(response, list[Resource])
 
     def request_get_lti_form(self, obj_id: str):
         return self.session.get(f"{settings.base_url_lms_api}lti-resource-libraries/{obj_id}/lti-form")
@@ -59,7 +59,7 @@ class ResourceLibraryApi(LmsAsyncApi[ResourceLibraryModel, CreateResourceLibrary
             response = self.request_get_lti_form(obj_id)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return LtiResourceInitModel.parse_raw(response.text)
+            return parse_response(response, LtiResourceInitModel)
 
 
 class ResourceLibrary(LMSApiObject[ResourceLibraryModel, ResourceLibraryApi]):
@@ -0,0 +1,39 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# fetches page_size items starting from offset and tells whether it is the last page
+PageFetcher = Callable[[int, int], tuple[list[T], bool]]
+
+
+def iter_pages(fetch_page: PageFetcher[T], page_size: int, offset: int = 0, limit: int | None = None) -> Iterator[T]:
+    """
+    Lazily iterates over a paginated listing.
+    The next page is requested in a background thread while the current one is being consumed, and nothing more is
+    requested once the caller stops iterating. So only two pages are kept in memory at a time.
+
+    fetch_page: requests page_size items starting from offset
+    limit: the maximum number of items to iterate over, all items when None
+    """
+    if page_size <= 0:
+        raise ValueError(f"page_size must be positive, got {page_size}")
+
+    def request_page(page_offset: int) -> Future[tuple[list[T], bool]]:
+        page_limit = page_size if limit is None else min(page_size, offset + limit - page_offset)
+        return executor.submit(fetch_page, page_offset, page_limit)
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-prefetch")
+    next_page: Future | None = request_page(offset)
+    try:
+        page_offset = offset
+        while next_page is not None:
+            items, is_last = next_page.result()
+            page_offset += len(items)
+            has_more = not is_last and len(items) == page_size and (limit is None or page_offset < offset + limit)
+            next_page = request_page(page_offset) if has_more else None
+            yield from items
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
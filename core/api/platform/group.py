@@ -1,9 +1,9 @@
 from http import HTTPStatus
 
-from pydantic import parse_raw_as
 from requests import Response
 
 from core.api.base_api import ObjectCreatableApi, ObjectQueryableApi, ObjectUpdateableApi, check_response
+from core.api.decoding import parse_response
 from core.api.platform.base import PlatformGettableApi
 from core.models.platform.base import PlatformListModel
 from core.models.platform.group import CreateGroup, Group, UpdateGroup, UserMembershipInGroup, UserWithGroupMembership
@@ -35,7 +35,7 @@ class GroupsApi(
         response = self.request_get_users(obj_id)
         check_response(response, HTTPStatus.OK)
 
-        return parse_raw_as(PlatformListModel[UserWithGroupMembership], response.text)
+        return parse_response(response, PlatformListModel[UserWithGroupMembership])
 
     def request_get_user(self, obj_id: str, user_id: str) -> Response:
         return self.session.get(f"{self.get_instance_url(obj_id)}/users/{user_id}")
@@ -44,7 +44,7 @@ class GroupsApi(
         response = self.request_get_user(obj_id, user_id)
         check_response(response, HTTPStatus.OK)
 
-        return parse_raw_as(PlatformListModel[UserMembershipInGroup], response.text)
+        return parse_response(response, PlatformListModel[UserMembershipInGroup])
 
     def request_delete_user(self, obj_id: str, user_id: str) -> Response:
         return self.session.delete(f"{self.get_instance_url(obj_id)}/users/{user_id}", json={})
@@ -1,9 +1,9 @@
 from http import HTTPStatus
 
 import allure
-from pydantic import parse_raw_as
 
 from core.api.base_api import ObjectQueryableApi
+from core.api.decoding import parse_response
 from core.api.platform.base import PlatformGettableApi
 from core.models.platform.base import PlatformListModel
 from core.models.platform.role_pattern import RolePattern, RolePatternPermission
@@ -38,4 +38,4 @@ class RolePatternsApi(
         with allure.step("Get role pattern permissions"):
             response = self.session.get(f"{self.get_instance_url(obj_id)}/role-pattern-permissions", params=params)
             assert_response_status(response.status_code, HTTPStatus.OK)
-            return parse_raw_as(PlatformListModel[RolePatternPermission], response.text)
+            return parse_response(response, PlatformListModel[RolePatternPermission])
@@ -1,9 +1,9 @@
 from http import HTTPStatus
 
 import allure
-from pydantic import parse_raw_as
 
 from core.api.base_api import ObjectCreatableApi, ObjectDeleteableApi, ObjectQueryableApi, ObjectUpdateableApi
+from core.api.decoding import parse_response
 from core.api.platform.base import PlatformGettableApi
 from core.models.platform.base import PlatformListModel
 from core.models.platform.permission import PermissionAssignedToRole
@@ -42,4 +42,4 @@ class RolesApi(
         with allure.step("Get role permissions"):
             response = self.session.get(f"{self.get_instance_url(obj_id)}/permissions", params=params)
             assert_response_status(response.status_code, HTTPStatus.OK)
-            return parse_raw_as(PlatformListModel[PermissionAssignedToRole], response.text)
+            return parse_response(response, PlatformListModel[PermissionAssignedToRole])
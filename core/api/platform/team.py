@@ -1,9 +1,9 @@
 from http import HTTPStatus
 
-from pydantic import parse_raw_as
 from requests import Response
 
 from core.api.base_api import ObjectCreatableApi, ObjectDeleteableApi, ObjectQueryableApi, ObjectUpdateableApi
+from core.api.decoding import parse_response
 from core.api.platform.base import PlatformGettableApi
 from core.models.platform.base import PlatformListModel
 from core.models.platform.platform_user import UserWithUserRoleId
@@ -32,7 +32,7 @@ class TeamsApi(
         response = self.request_get_users(obj_id)
         assert_response_status(response.status_code, HTTPStatus.OK)
 
-        return parse_raw_as(PlatformListModel[UserWithUserRoleId], response.text)
+        return parse_response(response, PlatformListModel[UserWithUserRoleId])
 
     def requeste_get_roles(self, obj_id: str) -> Response:
         return self.session.get(f"{self.get_instance_url(obj_id)}/roles")
@@ -41,4 +41,4 @@ class TeamsApi(
         response = self.requeste_get_roles(obj_id)
         assert_response_status(response.status_code, HTTPStatus.OK)
 
-        return parse_raw_as(PlatformListModel[Role], response.text)
+        return parse_response(response, PlatformListModel[Role])
@@ -1,10 +1,10 @@
 from http import HTTPStatus
 
 import allure
-from pydantic import parse_raw_as
 from requests import Response
 
 from core.api.base_api import ObjectCreatableApi, ObjectQueryableApi, ObjectUpdateableApi
+from core.api.decoding import parse_response
 from core.api.platform.base import PlatformGettableApi
 from core.models.platform.base import PlatformListModel
 from core.models.platform.platform_user import CreatePlatformUser, PlatformUser, UpdatePlatformUser
@@ -35,4 +35,4 @@ class UsersApi(
         with allure.step("Get user roles"):
             response = self.request_user_roles(obj_id)
             assert_response_status(response.status_code, HTTPStatus.OK)
-            return parse_raw_as(PlatformListModel[RoleAssignedToUser], response.text)
+            return parse_response(response, PlatformListModel[RoleAssignedToUser])
@@ -0,0 +1,262 @@
+import base64
+import hashlib
+import json
+import logging
+import shutil
+import threading
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from core.api.conditional import CONDITIONAL_HEADERS
+from settings import settings
+from util.file_lock import file_lock
+
+
+class UrlFamily(NamedTuple):
+    """
+    A group of urls serving the same stand-wide reference data
+    """
+
+    name: str
+    # GET requests to urls with these prefixes are cached
+    cached: tuple[str, ...]
+    # a write to urls with these prefixes invalidates the family, the cached prefixes are used when empty
+    written: tuple[str, ...] = ()
+    # any request to urls with these prefixes invalidates the family
+    invalidating: tuple[str, ...] = ()
+
+    def is_cached(self, url: str) -> bool:
+        return url.startswith(self.cached)
+
+    def is_invalidated_by(self, method: str, url: str) -> bool:
+        if url.startswith(self.invalidating):
+            return True
+        return method not in ("GET", "HEAD", "OPTIONS") and url.startswith(self.written or self.cached)
+
+
+def _lms_family(path_name: str) -> UrlFamily:
+    # only the query listing is cached, instances and their nested endpoints (resources, actions...) change with
+    # writes to other services, e.g. SCORM uploads.
+    # LMS writes are async, the data changes when a command completes, so polling a command invalidates the family too
+    return UrlFamily(
+        name=path_name,
+        cached=(f"{settings.base_url_lms_api}{path_name}/query",),
+        written=(f"{settings.base_url_lms_api}{path_name}",),
+        invalidating=tuple(f"{settings.base_url_lms_api}{cmd}-{path_name}" for cmd in ("create", "update", "delete")),
+    )
+
+
+REFERENCE_URL_FAMILIES = (
+    _lms_family("resource-libraries"),
+    UrlFamily(name="roles", cached=(f"{settings.base_url_platform_api}roles",)),
+    UrlFamily(
+        name="current user",
+        cached=(f"{settings.base_url_platform_api}users/me",),
+        written=(f"{settings.base_url_platform_api}users",),
+    ),
+    UrlFamily(name="translation backends", cached=(f"{settings.base_url_labs}api/translation-backends/",)),
+    UrlFamily(name="virtual networks", cached=(f"{settings.base_url}/api/labs/providers/",)),
+)
+
+
+class CachedResponse(NamedTuple):
+    stored_at: float
+    status_code: int
+    reason: str
+    headers: dict[str, str]
+    content: bytes
+    encoding: str | None
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CachedResponse":
+        return cls(
+            stored_at=time.time(),
+            status_code=response.status_code,
+            reason=response.reason,
+            headers=dict(response.headers),
+            content=response.content,
+            encoding=response.encoding,
+        )
+
+    def to_response(self, request: PreparedRequest, adapter: BaseAdapter) -> Response:
+        response = Response()
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = self.encoding
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+        return response
+
+    def to_json_dict(self) -> dict[str, Any]:
+        return {**self._asdict(), "content": base64.b64encode(self.content).decode()}
+
+    @classmethod
+    def from_json_dict(cls, data: dict[str, Any]) -> "CachedResponse":
+        return cls(**{**data, "content": base64.b64decode(data["content"])})
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_json_dict())
+
+    @classmethod
+    def from_json(cls, text: str) -> "CachedResponse":
+        return cls.from_json_dict(json.loads(text))
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.invalidations: Counter[str] = Counter()
+
+    def hit(self, family: str):
+        with self._lock:
+            self.hits[family] += 1
+
+    def miss(self, family: str):
+        with self._lock:
+            self.misses[family] += 1
+
+    def invalidated(self, family: str):
+        with self._lock:
+            self.invalidations[family] += 1
+
+    def merge(self, stats: dict[str, dict[str, int]]):
+        """Adds up counters collected by another process, e.g. by an xdist worker"""
+        with self._lock:
+            for family, counters in stats.items():
+                self.hits[family] += counters["hits"]
+                self.misses[family] += counters["misses"]
+                self.invalidations[family] += counters["invalidations"]
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                family: {
+                    "hits": self.hits[family],
+                    "misses": self.misses[family],
+                    "invalidations": self.invalidations[family],
+                }
+                for family in sorted(self.hits.keys() | self.misses.keys() | self.invalidations.keys())
+            }
+
+
+class ReferenceCache:
+    """
+    A read-through cache of stand-wide reference data for the transport adapter.
+    Entries are keyed by (stand, session identity, url with sorted params), expire after ttl seconds and the least
+    recently used ones are evicted above max_entries. Any write to a family drops all its entries.
+    With a directory, entries are also stored on disk to be shared between xdist workers and runs. Other workers keep
+    their in-memory entries after a write until they expire, so the ttl should be short enough for that.
+    """
+
+    def __init__(self, families: tuple[UrlFamily, ...], ttl: float, max_entries: int, directory: Path | None = None):
+        self.families = families
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.directory = directory
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], CachedResponse] = OrderedDict()
+
+    def cached_family(self, request: PreparedRequest) -> UrlFamily | None:
+        # conditional requests are answered by the backend, a cached 200 would defeat their purpose
+        if request.method != "GET" or any(header in request.headers for header in CONDITIONAL_HEADERS):
+            return None
+        return next((family for family in self.families if family.is_cached(request.url)), None)
+
+    def invalidate_by(self, request: PreparedRequest):
+        for family in self.families:
+            if family.is_invalidated_by(request.method, request.url):
+                self.invalidate(family)
+
+    @staticmethod
+    def key(request: PreparedRequest) -> str:
+        scheme, netloc, path, query, _ = urlsplit(request.url)
+        url = urlunsplit((scheme, netloc, path, urlencode(sorted(parse_qsl(query, keep_blank_values=True))), ""))
+        identity = f'{request.headers.get("Authorization", "")}|{request.headers.get("Cookie", "")}'
+        raw_key = f"{settings.stand}|{hashlib.sha256(identity.encode()).hexdigest()}|{url}"
+        return hashlib.sha256(raw_key.encode()).hexdigest()
+
+    def get(self, family: UrlFamily, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get((family.name, key))
+            if entry is not None:
+                self._entries.move_to_end((family.name, key))
+
+        if entry is None and self.directory is not None:
+            entry = self._read(family, key)
+            if entry is not None:
+                self._store_in_memory(family, key, entry)
+
+        if entry is None or time.time() - entry.stored_at > self.ttl:
+            self.stats.miss(family.name)
+            return None
+
+        self.stats.hit(family.name)
+        return entry
+
+    def put(self, family: UrlFamily, key: str, entry: CachedResponse):
+        self._store_in_memory(family, key, entry)
+        if self.directory is not None:
+            self._write(family, key, entry)
+
+    def invalidate(self, family: UrlFamily):
+        with self._lock:
+            for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == family.name]:
+                del self._entries[entry_key]
+        if self.directory is not None:
+            with file_lock(self._family_lock_path(family)):
+                shutil.rmtree(self._family_dir(family), ignore_errors=True)
+        self.stats.invalidated(family.name)
+        logging.debug(f"reference cache of {family.name} is invalidated")
+
+    def _store_in_memory(self, family: UrlFamily, key: str, entry: CachedResponse):
+        with self._lock:
+            self._entries[(family.name, key)] = entry
+            self._entries.move_to_end((family.name, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _family_dir(self, family: UrlFamily) -> Path:
+        return self.directory / hashlib.sha256(f"{settings.stand}|{family.name}".encode()).hexdigest()[:32]
+
+    def _family_lock_path(self, family: UrlFamily) -> Path:
+        return self._family_dir(family).with_suffix(".lock")
+
+    def _read(self, family: UrlFamily, key: str) -> CachedResponse | None:
+        path = self._family_dir(family) / f"{key}.json"
+        with file_lock(self._family_lock_path(family)):
+            if not path.exists():
+                return None
+            try:
+                return CachedResponse.from_json(path.read_text())
+            except (ValueError, TypeError, KeyError):
+                logging.warning(f"ignoring corrupted reference cache file {path}")
+                return None
+
+    def _write(self, family: UrlFamily, key: str, entry: CachedResponse):
+        family_dir = self._family_dir(family)
+        with file_lock(self._family_lock_path(family)):
+            family_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = family_dir / f"{key}.tmp"
+            temp_path.write_text(entry.to_json())
+            temp_path.replace(family_dir / f"{key}.json")
+
+
+reference_cache = ReferenceCache(
+    families=REFERENCE_URL_FAMILIES,
+    ttl=settings.reference_cache_ttl,
+    max_entries=settings.reference_cache_max_entries,
+    directory=Path(settings.reference_cache_dir) if settings.reference_cache_persist else None,
+)
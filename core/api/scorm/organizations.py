@@ -6,6 +6,7 @@ from requests import Response
 
 from core.api.base import ApiObject, ApiObjectManager
 from core.api.base_api import ObjectApi
+from core.api.decoding import parse_response
 from core.models.lms.lms_base import LMSModelBase
 from core.models.scorm.organization import Organization as OrganizationModel
 from core.models.scorm.organization import UpdateOrganization
@@ -31,7 +32,7 @@ class OrganizationsApi(ObjectApi):
             response = self.request_post_file(resource_launch_id, file_path)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return OrganizationModel.parse_raw(response.text)
+            return parse_response(response, OrganizationModel)
 
     def request_get(self, resource_launch_id: str, obj_id: str) -> Response:
         return self.session.get(self.get_instance_url(obj_id), params={"resourceLaunchId": resource_launch_id})
@@ -41,14 +42,14 @@ class OrganizationsApi(ObjectApi):
             response = self.request_get(resource_launch_id, obj_id)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return OrganizationModel.parse_raw(response.text)
+            return parse_response(response, OrganizationModel)
 
     def put(self, resource_launch_id: str, obj_id: str, update_data: UpdateOrganization) -> OrganizationModel:
         with allure.step(f"Update {self.NAME} with ID {obj_id} using launch ID {resource_launch_id}"):
             response = self.request_put(resource_launch_id, obj_id, update_data)
             assert_response_status(response.status_code, HTTPStatus.OK)
 
-            return OrganizationModel.parse_raw(response.text)
+            return parse_response(response, OrganizationModel)
 
     def request_put(self, resource_launch_id: str, obj_id: str, payload: LMSModelBase | dict) -> Response:
         data = payload.lms_dict() if isinstance(payload, LMSModelBase) else payload
@@ -1,6 +1,7 @@
 from requests import Session
 
 from core.api.auth import authorization_ways
+from core.api.transport import SessionAuthentication, mount_transport_adapters
 from core.models.user import User
 from settings import settings
 from util.api.allure_reporting import record_response
@@ -14,9 +15,19 @@ class SessionManager:
         user = settings.stand_config.users.get(user_key, None)
         if user_key not in self.__sessions.keys():
             session = Session()
+            adapters = mount_transport_adapters(session)
             session.hooks["response"].append(record_response)
             appropriate_auth_function = authorization_ways[type(user)]
-            appropriate_auth_function(session=session, user=user)
+            token = appropriate_auth_function(session=session, user=user, user_key=user_key)
+            if token is not None:
+                authentication = SessionAuthentication(
+                    token,
+                    lambda rejected_token: appropriate_auth_function(
+                        session=session, user=user, user_key=user_key, rejected_token=rejected_token
+                    ),
+                )
+                for adapter in adapters:
+                    adapter.authentication = authentication
             self.__sessions[user_key] = session
         return self.__sessions[user_key]
 
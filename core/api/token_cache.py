@@ -0,0 +1,102 @@
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable, Generic, NamedTuple, TypeVar
+
+from pydantic import ValidationError
+
+from core.models.idp import AccessToken, LoginCookies
+from settings import settings
+from util.file_lock import file_lock
+
+
+class TokenKey(NamedTuple):
+    stand: str
+    user_key: str
+    client_id: str
+    scope: str
+
+    @property
+    def file_name(self) -> str:
+        return hashlib.sha256("|".join(self).encode()).hexdigest()[:32]
+
+
+class LoginCookiesKey(NamedTuple):
+    stand: str
+    user_key: str
+
+    @property
+    def file_name(self) -> str:
+        return hashlib.sha256("|".join(self).encode()).hexdigest()[:32]
+
+
+Key = TypeVar("Key", TokenKey, LoginCookiesKey)
+Credentials = TypeVar("Credentials", AccessToken, LoginCookies)
+
+
+class TokenCache(Generic[Key, Credentials]):
+    """
+    On-disk access token storage shared between xdist workers.
+    Every token is kept in its own file guarded by its own lock file, so only one worker performs a login
+    for a given (stand, user_key, client_id, scope) while the others wait and then reuse the result.
+    Other expiring credentials, e.g. cookies of a logged-in browser, are stored the same way.
+    """
+
+    def __init__(self, directory: Path, refresh_margin: float, model: type[Credentials] = AccessToken):
+        self.directory = directory
+        self.refresh_margin = refresh_margin
+        self.model = model
+
+    def _token_path(self, key: Key) -> Path:
+        return self.directory / f"{key.file_name}.json"
+
+    def _lock_path(self, key: Key) -> Path:
+        return self.directory / f"{key.file_name}.lock"
+
+    def _read(self, key: Key) -> Credentials | None:
+        path = self._token_path(key)
+        if not path.exists():
+            return None
+        try:
+            return self.model.parse_file(path)
+        except (ValidationError, ValueError):
+            logging.warning(f"ignoring corrupted token cache file {path}")
+            return None
+
+    def _write(self, key: Key, token: Credentials):
+        path = self._token_path(key)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(token.json())
+        temp_path.chmod(0o600)
+        temp_path.replace(path)
+
+    def get_or_fetch(
+        self, key: Key, fetch: Callable[[], Credentials], rejected_token: Credentials | None = None
+    ) -> Credentials:
+        """
+        Returns a cached token if it is valid for at least refresh_margin seconds, otherwise calls fetch
+        under the lock and stores its result for other workers.
+        rejected_token is a token the backend doesn't accept anymore. It is never returned, but a newer token
+        stored by another worker is still reused.
+        """
+        with file_lock(self._lock_path(key)):
+            token = self._read(key)
+            is_rejected = rejected_token is not None and token == rejected_token
+            if token is not None and not is_rejected and not token.expires_within(self.refresh_margin):
+                logging.debug(f"reusing cached token for {key.user_key}")
+                return token
+
+            logging.debug(f"requesting a new token for {key.user_key}")
+            token = fetch()
+            self._write(key, token)
+            return token
+
+
+token_cache: TokenCache[TokenKey, AccessToken] = TokenCache(
+    directory=Path(settings.token_cache_dir), refresh_margin=settings.token_refresh_margin
+)
+login_cookies_cache: TokenCache[LoginCookiesKey, LoginCookies] = TokenCache(
+    directory=Path(settings.token_cache_dir) / "cookies",
+    refresh_margin=settings.token_refresh_margin,
+    model=LoginCookies,
+)
@@ -0,0 +1,239 @@
+import logging
+import threading
+from collections import Counter
+from functools import cache
+from http import HTTPStatus
+from typing import Callable
+
+from requests import PreparedRequest, Response, Session
+from requests.adapters import HTTPAdapter
+from requests.utils import default_headers
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, Retry
+from urllib3.util.request import ACCEPT_ENCODING
+
+from core.api.cassette import cassette_recorder
+from core.api.fake_stand import fake_stand
+from core.api.reference_cache import CachedResponse, reference_cache
+from core.models.idp import AccessToken
+from settings import HttpBackend, HttpConnectionSettings, settings
+
+Authenticator = Callable[[AccessToken | None], AccessToken | None]
+
+REQUESTS_DEFAULT_ACCEPT_ENCODING = default_headers()["Accept-Encoding"]
+
+
+class ConnectionStats:
+    """
+    Counts requests and newly opened connections per backend to show how well connections are reused
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Counter[str] = Counter()
+        self.opened_connections: Counter[str] = Counter()
+
+    def request_sent(self, backend: str):
+        with self._lock:
+            self.requests[backend] += 1
+
+    def connection_opened(self, backend: str):
+        with self._lock:
+            self.opened_connections[backend] += 1
+
+    def merge(self, stats: dict[str, dict[str, int]]):
+        """Adds up counters collected by another process, e.g. by an xdist worker"""
+        with self._lock:
+            for backend, counters in stats.items():
+                self.requests[backend] += counters["requests"]
+                self.opened_connections[backend] += counters["opened"]
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        return {
+            str(backend): {
+                "requests": self.requests[backend],
+                "opened": self.opened_connections[backend],
+                "reused": max(self.requests[backend] - self.opened_connections[backend], 0),
+            }
+            for backend in sorted(self.requests.keys() | self.opened_connections.keys())
+        }
+
+
+connection_stats = ConnectionStats()
+
+
+@cache
+def _counting_pool_classes(backend: HttpBackend) -> dict[str, type[HTTPConnectionPool]]:
+    def _new_conn(pool_class: type[HTTPConnectionPool]):
+        def new_conn(self):
+            connection_stats.connection_opened(backend)
+            return pool_class._new_conn(self)
+
+        return new_conn
+
+    return {
+        "http": type("CountingHTTPConnectionPool", (HTTPConnectionPool,), {"_new_conn": _new_conn(HTTPConnectionPool)}),
+        "https": type(
+            "CountingHTTPSConnectionPool", (HTTPSConnectionPool,), {"_new_conn": _new_conn(HTTPSConnectionPool)}
+        ),
+    }
+
+
+class SessionAuthentication:
+    """
+    Keeps the token of a session managed by SessionManager.
+    It is shared by all transport adapters of the session, so the token is refreshed once for all backends.
+    """
+
+    def __init__(self, token: AccessToken, authenticate: Authenticator):
+        """
+        token: the token the session is currently authorized with
+        authenticate: a function to re-authorize the session. It receives a rejected token (None for a planned refresh)
+         and returns a new one.
+        """
+        self.token = token
+        self._authenticate = authenticate
+        self._refresh_lock = threading.RLock()
+        self._local = threading.local()
+
+    @property
+    def is_refreshing(self) -> bool:
+        return getattr(self._local, "is_refreshing", False)
+
+    def refresh(self, rejected_token: AccessToken | None = None) -> AccessToken:
+        with self._refresh_lock:
+            # another thread may have already refreshed the token while this one was waiting for the lock
+            if rejected_token is not None and self.token != rejected_token:
+                return self.token
+            if rejected_token is None and not self.token.expires_within(settings.token_refresh_margin):
+                return self.token
+
+            logging.info("refreshing the session token" + (" rejected by the backend" if rejected_token else ""))
+            self._local.is_refreshing = True
+            try:
+                self.token = self._authenticate(rejected_token)
+            finally:
+                self._local.is_refreshing = False
+            return self.token
+
+    def is_used_by(self, request: PreparedRequest) -> bool:
+        return not self.is_refreshing and request.headers.get("Authorization") == self.token.authorization_header
+
+
+class SessionTransportAdapter(HTTPAdapter):
+    """
+    A transport adapter for sessions managed by SessionManager.
+    It keeps the session token fresh: the token is refreshed right before it expires, and a request rejected with 401
+    leads to a single re-authentication. Idempotent requests are replayed with the new token after that.
+    GET requests of stand-wide reference data are served from the reference cache.
+    Connection pool, retries of connection errors, keep-alive and compression are configured per backend.
+    On the local stand requests are handled by the fake backends of core.api.fake_stand instead of the network.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def __init__(
+        self,
+        backend: HttpBackend = HttpBackend.DEFAULT,
+        connection_settings: HttpConnectionSettings | None = None,
+    ):
+        self.backend = backend
+        self.connection_settings = connection_settings or settings.http_connection_settings(backend)
+        self.authentication: SessionAuthentication | None = None
+        super().__init__(
+            pool_maxsize=self.connection_settings.pool_maxsize,
+            max_retries=Retry(
+                total=self.connection_settings.max_retries,
+                connect=self.connection_settings.max_retries,
+                read=False,
+                status=0,
+                other=0,
+                backoff_factor=self.connection_settings.retry_backoff_factor,
+                raise_on_status=False,
+            ),
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(self.backend)
+
+    def _prepare_headers(self, request: PreparedRequest):
+        if not self.connection_settings.keep_alive:
+            request.headers["Connection"] = "close"
+
+        if request.headers.get("Accept-Encoding") == REQUESTS_DEFAULT_ACCEPT_ENCODING:
+            request.headers["Accept-Encoding"] = ACCEPT_ENCODING if self.connection_settings.compression else "identity"
+
+    def _send(self, request: PreparedRequest, **kwargs) -> Response:
+        if cassette_recorder.is_active:
+            return cassette_recorder.send(request, self, lambda prepared: self._send_to_network(prepared, **kwargs))
+        return self._send_to_network(request, **kwargs)
+
+    def _send_to_network(self, request: PreparedRequest, **kwargs) -> Response:
+        connection_stats.request_sent(self.backend)
+        if fake_stand.is_in_process:
+            return fake_stand.send(request, self)
+        return super().send(request, **kwargs)
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        self._prepare_headers(request)
+
+        if not settings.reference_cache_enabled or kwargs.get("stream"):
+            return self._send_authenticated(request, **kwargs)
+
+        family = reference_cache.cached_family(request)
+        if family is None:
+            response = self._send_authenticated(request, **kwargs)
+            reference_cache.invalidate_by(request)
+            return response
+
+        key = reference_cache.key(request)
+        if cached_response := reference_cache.get(family, key):
+            return cached_response.to_response(request, self)
+
+        response = self._send_authenticated(request, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            reference_cache.put(family, key, CachedResponse.from_response(response))
+        return response
+
+    def _send_authenticated(self, request: PreparedRequest, **kwargs) -> Response:
+        authentication = self.authentication
+        if authentication is None or not authentication.is_used_by(request):
+            return self._send(request, **kwargs)
+
+        if authentication.token.expires_within(settings.token_refresh_margin):
+            authentication.refresh()
+            request.headers["Authorization"] = authentication.token.authorization_header
+
+        sent_token = authentication.token
+        response = self._send(request, **kwargs)
+        if response.status_code != HTTPStatus.UNAUTHORIZED:
+            return response
+
+        authentication.refresh(rejected_token=sent_token)
+        if request.method not in self.IDEMPOTENT_METHODS:
+            return response
+
+        logging.info(f"replaying {request.method} {request.url} with a new token")
+        response.close()
+        request.headers["Authorization"] = authentication.token.authorization_header
+        return self._send(request, **kwargs)
+
+
+def mount_transport_adapters(session: Session) -> list[SessionTransportAdapter]:
+    """
+    Mounts a separately configured adapter for every backend of the stand and a default one for other urls
+    """
+    if fake_stand.is_in_process:
+        fake_stand.install()
+
+    default_adapter = SessionTransportAdapter(HttpBackend.DEFAULT)
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+
+    adapters = [default_adapter]
+    for backend, url in settings.http_backend_urls.items():
+        adapter = SessionTransportAdapter(backend)
+        session.mount(url, adapter)
+        adapters.append(adapter)
+
+    return adapters
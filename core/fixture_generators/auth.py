@@ -1,17 +1,131 @@
+import logging
+import time
 from contextlib import contextmanager
+from http.cookiejar import Cookie
 
-from selene import be
+from requests import Session
+from selene import Browser, be, have
+from waiting.exceptions import TimeoutExpired
 
+from core.api.auth import emulate_login
+from core.api.token_cache import LoginCookiesKey, login_cookies_cache
+from core.api.transport import mount_transport_adapters
+from core.fixture_generators.driver import clear_browser_state
+from core.fixture_generators.storage_state import (
+    capture_storage_state,
+    forget_storage_state_script,
+    restore_storage_state,
+    set_cookies,
+    storage_states,
+)
+from core.models.idp import BrowserCookie, LoginCookies
 from core.web.pages.identity import IdentityLoginPage
-from settings import settings
+from core.web.pages.platform_base_page import Profile
+from settings import UiLoginMode, settings
+from util.polling import wait_for
+
+
+def is_logged_in(selene_browser: Browser) -> bool:
+    """
+    Checks that the opened application is not redirected to the identity login page.
+    Waits for the logged-in user avatar or the redirect for settings.recheck_timeout at most, a page on base_url
+    without the avatar is considered logged in after that.
+    """
+    driver = selene_browser.driver
+    profile_icon = Profile().profile_icon
+
+    def is_settled() -> bool:
+        return driver.current_url.startswith(settings.base_url_identity) or profile_icon.matching(be.present)
+
+    try:
+        wait_for(
+            is_settled,
+            operation="ui login check",
+            timeout_seconds=settings.recheck_timeout,
+            waiting_for="the logged-in user or the identity login page",
+        )
+    except TimeoutExpired:
+        pass
+    return not driver.current_url.startswith(settings.base_url_identity)
 
 
 @contextmanager
 def login_user(selene_browser, username):
-    selene_browser.open(settings.base_url)
-    identity_page = IdentityLoginPage()
-    identity_page.is_redirected()
-    identity_page.login_user(username)
-    identity_page.email_input.should(be.hidden)
+    state = storage_states.get(username) if settings.storage_state_enabled else None
+    if state is not None:
+        restore_script = restore_storage_state(selene_browser.driver, state)
+        try:
+            selene_browser.open(settings.base_url)
+        finally:
+            forget_storage_state_script(selene_browser.driver, restore_script)
+        if not is_logged_in(selene_browser):
+            # the session of the saved state was ended, e.g. by a logout in another test
+            logging.info(f"the saved storage state of {username} is not accepted anymore, logging in again")
+            storage_states.invalidate(username)
+            clear_browser_state(selene_browser.driver, settings)
+            state = None
+
+    if state is None:
+        if settings.ui_login_mode == UiLoginMode.COOKIES:
+            login_cookies = get_login_cookies(username)
+            set_cookies(selene_browser.driver, login_cookies.cookies)
+            selene_browser.open(settings.base_url)
+            if not is_logged_in(selene_browser):
+                # the cached cookies may belong to a session ended before they expired
+                logging.info(f"the cached login cookies of {username} are not accepted anymore, logging in again")
+                clear_browser_state(selene_browser.driver, settings)
+                set_cookies(selene_browser.driver, get_login_cookies(username, rejected=login_cookies).cookies)
+                selene_browser.open(settings.base_url)
+            selene_browser.should(have.no.url_containing(settings.base_url_identity))
+        else:
+            selene_browser.open(settings.base_url)
+            identity_page = IdentityLoginPage()
+            identity_page.is_redirected()
+            identity_page.login_user(username)
+            identity_page.email_input.should(be.hidden)
+
+        if settings.storage_state_enabled:
+            # the application stores its data after the page is loaded
+            selene_browser.should(have.url_containing(settings.base_url))
+            selene_browser.should(have.js_returned(True, "return document.readyState === 'complete'"))
+            storage_states.save(username, capture_storage_state(selene_browser.driver))
 
     yield selene_browser
+
+
+def _is_http_only(cookie: Cookie) -> bool:
+    # http.cookiejar keeps the nonstandard attributes as they are spelled by the server
+    return any(attribute.lower() == "httponly" for attribute in cookie._rest)
+
+
+def get_login_cookies(user_key: str, rejected: LoginCookies | None = None) -> LoginCookies:
+    """
+    Cookies of the login emulated over HTTP, they are shared between xdist workers until they expire.
+    rejected are cookies the application didn't accept, they are fetched again instead of being reused.
+    """
+
+    def fetch() -> LoginCookies:
+        session = Session()
+        mount_transport_adapters(session)
+        emulate_login(session, settings.stand_config.platform_users[user_key])
+        cookies = [
+            BrowserCookie(
+                name=cookie.name,
+                value=cookie.value,
+                domain=cookie.domain,
+                path=cookie.path,
+                secure=cookie.secure,
+                http_only=_is_http_only(cookie),
+                expires=cookie.expires,
+            )
+            for cookie in session.cookies
+        ]
+        lifetime_end = time.time() + settings.login_cookies_lifetime
+        expires_at = min([lifetime_end, *(cookie.expires for cookie in cookies if cookie.expires is not None)])
+        return LoginCookies(cookies=cookies, expires_at=expires_at)
+
+    if not settings.token_cache_enabled:
+        return fetch()
+    return login_cookies_cache.get_or_fetch(
+        LoginCookiesKey(stand=settings.base_url, user_key=user_key), fetch, rejected_token=rejected
+    )
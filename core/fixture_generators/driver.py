@@ -1,10 +1,17 @@
-from collections import OrderedDict
-from contextlib import contextmanager
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Sequence, TypeVar
+from urllib.parse import urlsplit
 
 import allure_commons
+import urllib3
 from selene import Browser, Config
 from selene import browser as shared_default_browser
 from selenium import webdriver
+from selenium.common import WebDriverException
 from selenium.webdriver.remote.webdriver import WebDriver
 
 import settings
@@ -12,27 +19,134 @@ from util.web.assist.selene.report.report import wait_with
 from util.web.assist.selenium.types import WebDriverOptions
 from util.web.assist.webdriver_manager import set_up, supported
 
+T = TypeVar("T")
+# a crashed local driver doesn't answer at all, so urllib3 errors are raised instead of WebDriverException
+DRIVER_CONNECTION_ERRORS = (WebDriverException, urllib3.exceptions.HTTPError, OSError)
+
+
+class WebDriverPool:
+    """
+    Started drivers of a worker, leased by browser sessions. A released driver is reset to a clean state (cookies,
+    storage, extra tabs, window size) in background instead of being quit.
+    The pool is filled up to its size in background on the first lease, so leasing a warm driver takes milliseconds.
+    More drivers than the size are started when all of them are leased, the extra ones are quit on release.
+    """
+
+    def __init__(self, start_driver: Callable[[], WebDriver], reset_driver: Callable[[WebDriver], None], size: int):
+        self._start_driver = start_driver
+        self._reset_driver = reset_driver
+        self.size = size
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="webdriver-pool")
+        # started drivers and drivers being started or reset
+        self._idle: deque[Future[WebDriver]] = deque()
+        self._leased: set[WebDriver] = set()
+        self._closed = False
+
+    def lease(self) -> WebDriver:
+        with self._lock:
+            if not self._idle:
+                self._idle.append(self._executor.submit(self._start_driver))
+            # a ready driver is preferred to the one being started
+            future = next((future for future in self._idle if future.done()), self._idle[0])
+            self._idle.remove(future)
+            self._fill()
+
+        driver = future.result()
+        if not self._is_alive(driver):
+            logging.info("a pooled driver is not alive anymore, starting a new one")
+            self._quit(driver)
+            driver = self._start_driver()
+
+        with self._lock:
+            self._leased.add(driver)
+        return driver
+
+    def release(self, driver: WebDriver):
+        with self._lock:
+            self._leased.discard(driver)
+            if self._closed or len(self._idle) >= self.size:
+                self._quit(driver)
+                return
+            self._idle.append(self._executor.submit(self._recycle, driver))
+
+    def close(self):
+        """Quits idle drivers, leased ones are left to their sessions, e.g. held at exit"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, deque()
+        for future in idle:
+            try:
+                self._quit(future.result())
+            except WebDriverException as error:
+                logging.warning(f"a pooled driver failed to start: {error}")
+        self._executor.shutdown(wait=False)
+
+    def _fill(self):
+        while len(self._idle) + len(self._leased) + 1 < self.size:
+            self._idle.append(self._executor.submit(self._start_driver))
+
+    def _recycle(self, driver: WebDriver) -> WebDriver:
+        try:
+            self._reset_driver(driver)
+            return driver
+        except DRIVER_CONNECTION_ERRORS as error:
+            logging.info(f"failed to reset a driver, starting a new one: {error}")
+            self._quit(driver)
+            return self._start_driver()
+
+    @staticmethod
+    def _is_alive(driver: WebDriver) -> bool:
+        try:
+            return bool(driver.window_handles)
+        except DRIVER_CONNECTION_ERRORS:
+            return False
+
+    @staticmethod
+    def _quit(driver: WebDriver):
+        try:
+            driver.quit()
+        except DRIVER_CONNECTION_ERRORS as error:
+            logging.debug(f"failed to quit a driver: {error}")
+
 
 class BrowserSessionsManager:
-    def __init__(self):
+    def __init__(self, driver_pool: WebDriverPool | None = None):
         self._sessions: OrderedDict[Browser] = OrderedDict()
+        self.driver_pool = driver_pool
 
-    def add_session(self, browser_session: Browser):
-        if browser_session.description in self._sessions.keys():
+    def new_driver(self, settings_instance: settings.Settings) -> WebDriver:
+        return self.driver_pool.lease() if self.driver_pool else _driver_from(settings_instance)
+
+    def check_name_is_free(self, browser_name: str):
+        """Raises before a driver is leased for a session that can't be added"""
+        if browser_name in self._sessions.keys():
             raise KeyError(
                 f"You are trying to run second browser with the same name! "
-                f"adding {browser_session.description};"
+                f"adding {browser_name};"
                 f" already active browsers are: {[str(browser_session) for browser_session in self._sessions.keys()]}"
             )
+
+    def add_session(self, browser_session: Browser):
+        self.check_name_is_free(browser_session.description)  # noqa: the attribute is from monkeypatching
         self._sessions[browser_session.description] = browser_session  # noqa: the attribute is from monkeypatching
 
     def finish_session(self, browser_session: Browser):
         for name, session in self._sessions.items():
             if session == browser_session:
-                session.quit()
+                if self.driver_pool:
+                    self.driver_pool.release(session.driver)
+                else:
+                    session.quit()
+                # the released driver is leased by other sessions, "..." is how selene marks a driver as not set
+                session.config.driver = ...
                 del self._sessions[name]
                 break
 
+    def close(self):
+        if self.driver_pool:
+            self.driver_pool.close()
+
     @property
     def active_sessions(self) -> tuple[Browser]:
         return tuple(self._sessions.values())
@@ -40,21 +154,23 @@ class BrowserSessionsManager:
 
 @contextmanager
 def setup_default_browser(settings_instance: settings.Settings, sessions_manager: BrowserSessionsManager) -> Browser:
+    sessions_manager.check_name_is_free(settings_instance.default_browser_name)
     shared_default_browser.config.base_url = settings_instance.base_url
     shared_default_browser.config.timeout = settings_instance.default_ui_timeout
     shared_default_browser.config.save_page_source_on_failure = settings_instance.save_page_source_on_failure
     shared_default_browser.config._wait_decorator = wait_with(context=allure_commons._allure.StepContext)
-    shared_default_browser.config.driver = _driver_from(settings_instance)
+    shared_default_browser.config.driver = sessions_manager.new_driver(settings_instance)
 
     shared_default_browser.as_(settings_instance.default_browser_name)  # noqa: the attribute is from monkeypatching
 
     sessions_manager.add_session(shared_default_browser)
 
-    yield shared_default_browser
-
-    shared_default_browser.config.hold_driver_at_exit = settings_instance.hold_driver_at_exit
-    if not settings_instance.hold_driver_at_exit:
-        sessions_manager.finish_session(shared_default_browser)
+    try:
+        yield shared_default_browser
+    finally:
+        shared_default_browser.config.hold_driver_at_exit = settings_instance.hold_driver_at_exit
+        if not settings_instance.hold_driver_at_exit:
+            sessions_manager.finish_session(shared_default_browser)
 
 
 @contextmanager
@@ -68,6 +184,7 @@ def setup_secondary_browser(
             f"Browser name {browser_name} should not end with {settings_instance.default_browser_name}. "
             f"Please, use another name."
         )
+    sessions_manager.check_name_is_free(browser_name)
 
     config = Config(
         base_url=settings_instance.base_url,
@@ -76,16 +193,50 @@ def setup_secondary_browser(
         _wait_decorator=wait_with(context=allure_commons._allure.StepContext),
     )
     browser_instance = Browser(config)
-    browser_instance.config.driver = _driver_from(settings_instance)
+    browser_instance.config.driver = sessions_manager.new_driver(settings_instance)
 
     browser_instance.as_(browser_name)  # noqa: the attribute is from monkeypatching
     sessions_manager.add_session(browser_instance)
 
-    yield browser_instance
+    # finished even when another browser started with it in setup_secondary_browsers fails
+    try:
+        yield browser_instance
+    finally:
+        browser_instance.config.hold_driver_at_exit = settings_instance.hold_driver_at_exit
+        if not settings_instance.hold_driver_at_exit:
+            sessions_manager.finish_session(browser_instance)
+
+
+@contextmanager
+def setup_secondary_browsers(
+    settings_instance: settings.Settings, sessions_manager: BrowserSessionsManager, browser_names: Sequence[str]
+) -> list[Browser]:
+    """
+    Starts browsers of several participants at the same time, so they are ready in about the time of one
+    """
+    with ExitStack() as stack:
+        browsers = run_in_parallel(
+            *(
+                lambda name=name: stack.enter_context(
+                    setup_secondary_browser(settings_instance, sessions_manager, browser_name=name)
+                )
+                for name in browser_names
+            )
+        )
+        yield browsers
 
-    browser_instance.config.hold_driver_at_exit = settings_instance.hold_driver_at_exit
-    if not settings_instance.hold_driver_at_exit:
-        sessions_manager.finish_session(browser_instance)
+
+def run_in_parallel(*calls: Callable[[], T]) -> list[T]:
+    """
+    Runs calls at the same time, e.g. join flows of participants each in its own browser, and returns their results.
+    All calls are finished before the first error is raised.
+    Allure steps of the calls are reported as they happen, so they may be nested into steps of each other.
+    """
+    if len(calls) <= 1:
+        return [call() for call in calls]
+    with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="parallel-browsers") as executor:
+        futures = [executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
 
 
 def _driver_from(settings_instance: settings.Settings) -> WebDriver:
@@ -105,6 +256,11 @@ def _driver_from(settings_instance: settings.Settings) -> WebDriver:
         )
     )
 
+    _tune_window(driver, settings_instance)
+    return driver
+
+
+def _tune_window(driver: WebDriver, settings_instance: settings.Settings):
     if settings_instance.maximize_window:
         driver.maximize_window()
     else:
@@ -113,7 +269,51 @@ def _driver_from(settings_instance: settings.Settings) -> WebDriver:
             height=settings_instance.window_height,
         )
 
-    return driver
+
+def stand_ui_origins(settings_instance: settings.Settings) -> list[str]:
+    urls = (
+        settings_instance.base_url,
+        settings_instance.base_url_identity,
+        settings_instance.base_url_assessment_ui,
+        settings_instance.base_url_scorm,
+    )
+    origins = [f"{parts.scheme}://{parts.netloc}" for parts in map(urlsplit, urls) if parts.netloc]
+    return list(dict.fromkeys(origins))
+
+
+def clear_browser_state(driver: WebDriver, settings_instance: settings.Settings):
+    """Removes cookies and web storage of the stand origins"""
+    if hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in stand_ui_origins(settings_instance):
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    else:
+        # without CDP, cookies and storage are accessible for the origin of the opened page only
+        for origin in stand_ui_origins(settings_instance):
+            driver.get(origin)
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+
+
+def _reset_driver_state(driver: WebDriver, settings_instance: settings.Settings):
+    """Brings a driver to the state of a just started one without restarting the browser"""
+    first_tab, *extra_tabs = driver.window_handles
+    for tab in extra_tabs:
+        driver.switch_to.window(tab)
+        driver.close()
+    driver.switch_to.window(first_tab)
+
+    clear_browser_state(driver, settings_instance)
+    driver.get("about:blank")
+    _tune_window(driver, settings_instance)
+
+
+def driver_pool_from(settings_instance: settings.Settings) -> WebDriverPool:
+    return WebDriverPool(
+        start_driver=lambda: _driver_from(settings_instance),
+        reset_driver=lambda driver: _reset_driver_state(driver, settings_instance),
+        size=settings_instance.browser_pool_size,
+    )
 
 
 def _driver_options_from(settings_instance: settings.Settings) -> WebDriverOptions:
@@ -0,0 +1,214 @@
+"""
+Storage state snapshots: cookies and web storage of a browser logged in as a user.
+
+The first login of a user key saves the state of the browser to a file of the stand, which is shared by xdist workers
+and runs. Later sessions restore the state through the driver before the first page is opened, so they start already
+authenticated.
+"""
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from pydantic import ValidationError
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from core.fixture_generators.driver import stand_ui_origins
+from core.models.idp import BrowserCookie, OriginStorage, StorageState
+from settings import settings
+from util.file_lock import file_lock
+
+CAPTURE_STORAGE_SCRIPT = """
+const copy = storage => Object.fromEntries(Array.from({length: storage.length}, (_, i) => storage.key(i))
+    .map(key => [key, storage.getItem(key)]));
+return {local_storage: copy(window.localStorage), session_storage: copy(window.sessionStorage)};
+"""
+# chromium drivers remove the script when the first page is opened (see login_user), so the items removed by the
+# application later are not restored again and nothing is left in the storage of the application
+RESTORE_STORAGE_SCRIPT = """
+const origins = %s;
+const storage = origins[window.location.origin];
+if (storage) {
+    Object.entries(storage.local_storage).forEach(([key, value]) => window.localStorage.setItem(key, value));
+    Object.entries(storage.session_storage).forEach(([key, value]) => window.sessionStorage.setItem(key, value));
+}
+"""
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class StorageStateStore:
+    """
+    Storage states of users of a stand, kept in a single file guarded by a lock file
+    """
+
+    def __init__(self, directory: Path, refresh_margin: float):
+        self.directory = directory
+        self.refresh_margin = refresh_margin
+
+    @property
+    def _path(self) -> Path:
+        return self.directory / f"{hashlib.sha256(settings.base_url.encode()).hexdigest()[:32]}.json"
+
+    def _read_all(self) -> dict[str, dict]:
+        if not self._path.exists():
+            return {}
+        try:
+            return json.loads(self._path.read_text())
+        except ValueError:
+            logging.warning(f"ignoring corrupted storage state file {self._path}")
+            return {}
+
+    def _write_all(self, states: dict[str, dict]):
+        temp_path = self._path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(states))
+        temp_path.chmod(0o600)
+        temp_path.replace(self._path)
+
+    def get(self, user_key: str) -> StorageState | None:
+        with file_lock(self._path.with_suffix(".lock")):
+            state_data = self._read_all().get(user_key)
+        if state_data is None:
+            return None
+        try:
+            state = StorageState.parse_obj(state_data)
+        except ValidationError:
+            logging.warning(f"ignoring corrupted storage state of {user_key}")
+            return None
+        return None if state.expires_within(self.refresh_margin) else state
+
+    def save(self, user_key: str, state: StorageState):
+        with file_lock(self._path.with_suffix(".lock")):
+            states = self._read_all()
+            states[user_key] = json.loads(state.json())
+            self._write_all(states)
+
+    def invalidate(self, user_key: str):
+        with file_lock(self._path.with_suffix(".lock")):
+            states = self._read_all()
+            if states.pop(user_key, None) is not None:
+                self._write_all(states)
+
+
+def set_cookies(driver: WebDriver, cookies: list[BrowserCookie]):
+    if hasattr(driver, "execute_cdp_cmd"):
+        # cookies of any domain are set without opening its pages
+        driver.execute_cdp_cmd(
+            "Network.setCookies",
+            {
+                "cookies": [
+                    {
+                        "name": cookie.name,
+                        "value": cookie.value,
+                        "domain": cookie.domain,
+                        "path": cookie.path,
+                        "secure": cookie.secure,
+                        "httpOnly": cookie.http_only,
+                        **({"expires": cookie.expires} if cookie.expires is not None else {}),
+                    }
+                    for cookie in cookies
+                ]
+            },
+        )
+        return
+
+    # webdriver sets cookies for the domain of the opened page only
+    for origin in stand_ui_origins(settings):
+        host = urlsplit(origin).hostname
+        origin_cookies = [cookie for cookie in cookies if _is_cookie_of(cookie, host)]
+        if not origin_cookies:
+            continue
+        driver.get(origin)
+        for cookie in origin_cookies:
+            driver.add_cookie(
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "secure": cookie.secure,
+                    "httpOnly": cookie.http_only,
+                    **({"expiry": int(cookie.expires)} if cookie.expires is not None else {}),
+                }
+            )
+
+
+def _is_cookie_of(cookie: BrowserCookie, host: str) -> bool:
+    domain = cookie.domain.lstrip(".")
+    return host == domain or host.endswith(f".{domain}")
+
+
+def capture_storage_state(driver: WebDriver) -> StorageState:
+    """Captures all cookies of the browser and web storage of the opened page, expiring with the stand cookies"""
+    if hasattr(driver, "execute_cdp_cmd"):
+        cookies = [
+            BrowserCookie(
+                name=cookie["name"],
+                value=cookie["value"],
+                domain=cookie["domain"],
+                path=cookie["path"],
+                secure=cookie["secure"],
+                http_only=cookie["httpOnly"],
+                # session cookies have a negative expiration
+                expires=cookie["expires"] if cookie["expires"] >= 0 else None,
+            )
+            for cookie in driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        ]
+    else:
+        cookies = [
+            BrowserCookie(
+                name=cookie["name"],
+                value=cookie["value"],
+                domain=cookie["domain"],
+                path=cookie.get("path", "/"),
+                secure=cookie.get("secure", False),
+                http_only=cookie.get("httpOnly", False),
+                expires=cookie.get("expiry"),
+            )
+            for cookie in driver.get_cookies()
+        ]
+
+    storage = OriginStorage.parse_obj(driver.execute_script(CAPTURE_STORAGE_SCRIPT))
+    # third-party cookies (analytics, CDNs) may expire any time, only the stand cookies keep the login
+    stand_hosts = [urlsplit(origin).hostname for origin in stand_ui_origins(settings)]
+    stand_cookies = [cookie for cookie in cookies if any(_is_cookie_of(cookie, host) for host in stand_hosts)]
+    lifetime_end = time.time() + settings.login_cookies_lifetime
+    return StorageState(
+        cookies=cookies,
+        origins={_origin(driver.current_url): storage},
+        expires_at=min([lifetime_end, *(cookie.expires for cookie in stand_cookies if cookie.expires is not None)]),
+    )
+
+
+def restore_storage_state(driver: WebDriver, state: StorageState) -> str | None:
+    """
+    Restores the state before a page of its origins is opened.
+    For chromium drivers the web storage is filled by a script run on new documents, its identifier is returned
+    to be removed with forget_storage_state_script when the page is opened.
+    Other drivers open the origins to fill their storage.
+    """
+    set_cookies(driver, state.cookies)
+    origins = {origin: storage.dict() for origin, storage in state.origins.items()}
+    if hasattr(driver, "execute_cdp_cmd"):
+        script = RESTORE_STORAGE_SCRIPT % json.dumps(origins)
+        return driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})["identifier"]
+
+    for origin in origins:
+        driver.get(origin)
+        driver.execute_script(RESTORE_STORAGE_SCRIPT % json.dumps(origins))
+    return None
+
+
+def forget_storage_state_script(driver: WebDriver, identifier: str | None):
+    if identifier is not None:
+        driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+
+
+storage_states = StorageStateStore(
+    directory=Path(settings.storage_state_dir), refresh_margin=settings.token_refresh_margin
+)
@@ -1,4 +1,6 @@
-from pydantic import Field
+import time
+
+from pydantic import BaseModel, Field
 
 from core.models.lms.lms_base import LMSModelBase
 
@@ -10,3 +12,56 @@ class LoginForm(LMSModelBase):
     remember_login: str = Field(alias="Input.RememberLogin")
     button: str
     request_verification_token: str = Field(alias="__RequestVerificationToken")
+
+
+class AccessToken(BaseModel):
+    access_token: str
+    token_type: str = "Bearer"
+    expires_at: float
+
+    @property
+    def authorization_header(self) -> str:
+        return f"{self.token_type} {self.access_token}"
+
+    def expires_within(self, seconds: float) -> bool:
+        return self.expires_at - time.time() <= seconds
+
+
+class BrowserCookie(BaseModel):
+    name: str
+    value: str
+    domain: str
+    path: str = "/"
+    secure: bool = False
+    http_only: bool = False
+    expires: float | None = None
+
+
+class LoginCookies(BaseModel):
+    """
+    Cookies of a browser logged in as a user
+    """
+
+    cookies: list[BrowserCookie]
+    expires_at: float
+
+    def expires_within(self, seconds: float) -> bool:
+        return self.expires_at - time.time() <= seconds
+
+
+class OriginStorage(BaseModel):
+    local_storage: dict[str, str] = {}
+    session_storage: dict[str, str] = {}
+
+
+class StorageState(BaseModel):
+    """
+    Cookies and web storage of a browser logged in as a user
+    """
+
+    cookies: list[BrowserCookie]
+    origins: dict[str, OriginStorage]
+    expires_at: float
+
+    def expires_within(self, seconds: float) -> bool:
+        return self.expires_at - time.time() <= seconds
@@ -1,10 +1,16 @@
 from functools import cached_property
-from typing import Dict, Generic, Tuple, Type, TypeVar
+from typing import Dict, Generic, List, Literal, Tuple, Type, TypeVar
+from weakref import WeakKeyDictionary
 
 import allure
 from selene import be, have
 from selene.core import query
 from selene.core.entity import Collection, Element
+from selene.core.locator import Locator
+from selene.core.wait import Query
+from selenium.common import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
 
 from core.web.elements.base_element import BaseElement
 from core.web.elements.dynamic.more_menu import MoreMenu, OldMoreMenu
@@ -17,6 +23,134 @@ CSS_or_XPATH = CSS | XPATH
 R = TypeVar("R", bound="Row")
 T = TypeVar("T", bound="Table[Row]")
 
+# Locators are told apart the same way selene does: xpath starts with "/", "./", ".." or "(".
+# Texts are taken like WebDriver does: rendered, with whitespace collapsed and trimmed.
+_FIND_JS = """
+const findAll = (context, locator) => {
+    if (!/^(\\/|\\.\\/|\\.\\.|\\()/.test(locator)) {
+        return Array.from(context.querySelectorAll(locator));
+    }
+    const found = document.evaluate(locator, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    return Array.from({length: found.snapshotLength}, (_, i) => found.snapshotItem(i));
+};
+const textOf = element => (element.innerText || "").replace(/\\u00a0/g, " ").replace(/[ \\t]+/g, " ")
+    .replace(/ *\\n */g, "\\n").trim();
+"""
+FIND_ROWS_SCRIPT = (
+    _FIND_JS
+    + """
+const [root, rowLocator, cellLocator, value] = arguments;
+return findAll(root, rowLocator).filter(row => {
+    const cell = findAll(row, cellLocator)[0];
+    return cell !== undefined && textOf(cell).includes(value);
+});
+"""
+)
+# Reads cell texts of rows in the browser, retrying until the table is ready or the timeout is over:
+# "values" - there are rows and all cells of the selected rows have text, like Row.values expects, with a filter at
+#   least one row is selected
+# "single" - exactly one row is selected, like Table.get_row_by_cell_value expects
+SNAPSHOT_SCRIPT = (
+    _FIND_JS
+    + """
+const [root, rowLocator, cellLocators, filter, waitFor, timeout, done] = arguments;
+const read = () => {
+    const rows = rowLocator === null ? [root] : findAll(root, rowLocator);
+    const selected = rows.map((row, index) => {
+        const values = {};
+        for (const [name, locator] of Object.entries(cellLocators)) {
+            const cell = findAll(row, locator)[0];
+            values[name] = cell === undefined ? null : textOf(cell);
+        }
+        return {index, values};
+    }).filter(row => filter === null
+        || (row.values[filter.column] !== null && row.values[filter.column].includes(filter.value)));
+    const ready = waitFor === "single"
+        ? selected.length === 1
+        : rows.length > 0 && (filter === null || selected.length > 0)
+            && selected.every(row => Object.values(row.values).every(value => value));
+    return {ready, total: rows.length, rows: selected};
+};
+const deadline = Date.now() + timeout;
+const poll = () => {
+    let snapshot;
+    try {
+        snapshot = read();
+    } catch (error) {
+        snapshot = {ready: false, total: 0, rows: [], error: String(error)};
+    }
+    if (snapshot.ready || Date.now() >= deadline) {
+        done(snapshot);
+    } else {
+        setTimeout(poll, 100);
+    }
+};
+poll();
+"""
+)
+STALE_ROOT_ATTEMPTS = 3
+_WEB_ELEMENT: Query[Element, WebElement] = Query("web element", lambda element: element())
+# script timeouts set to drivers, a snapshot waiting longer than the one set raises it
+_script_timeouts: WeakKeyDictionary[WebDriver, float] = WeakKeyDictionary()
+
+
+def rows_by_cell_text(rows_root: Element, row_locator: CSS_or_XPATH, cell_locator: CSS_or_XPATH, value: str) -> Element:
+    """
+    The first row having the value in the cell, like rows.by_their(cell_locator, have.text(value)).first, but located
+    in one call to the browser every time it is used
+    """
+
+    def locate() -> WebElement:
+        found = rows_root.config.driver.execute_script(FIND_ROWS_SCRIPT, rows_root(), row_locator, cell_locator, value)
+        if not found:
+            raise NoSuchElementException(f"no rows with {value} in {cell_locator}")
+        return found[0]
+
+    description = f"{rows_root}.all({row_locator}).by_their({cell_locator}, has text {value}).first"
+    return Element(Locator(description, locate), rows_root.config)
+
+
+def take_snapshot(
+    root: Element,
+    row_locator: CSS_or_XPATH | None,
+    cell_locators: Dict[str, CSS_or_XPATH],
+    filter_by: Tuple[str, str] | None = None,
+    wait_for: Literal["values", "single"] = "values",
+) -> List[Tuple[int, dict]]:
+    """
+    Indices and values of rows found by row_locator in root (root is the row itself without it) in one call to the
+    browser. filter_by is a pair of column_name and value that rows should have in the column, like have.text.
+    """
+    timeout = root.config.timeout
+    driver = root.config.driver
+    if _script_timeouts.get(driver, 0) < timeout + 10:
+        driver.set_script_timeout(timeout + 10)
+        _script_timeouts[driver] = timeout + 10
+
+    arguments = (
+        row_locator,
+        cell_locators,
+        {"column": filter_by[0], "value": filter_by[1]} if filter_by else None,
+        wait_for,
+        timeout * 1000,
+    )
+    for attempt in range(STALE_ROOT_ATTEMPTS):
+        try:
+            snapshot = driver.execute_async_script(SNAPSHOT_SCRIPT, root.get(_WEB_ELEMENT), *arguments)
+            break
+        except StaleElementReferenceException:
+            # the root is re-rendered, it is located again
+            if attempt == STALE_ROOT_ATTEMPTS - 1:
+                raise
+    rows = [(row["index"], row["values"]) for row in snapshot["rows"]]
+    if not snapshot["ready"]:
+        condition = "a single row" if wait_for == "single" else "rows with all cells filled"
+        if filter_by:
+            condition += f' having "{filter_by[1]}" in {filter_by[0]}'
+        state = snapshot.get("error") or f'{snapshot["total"]} rows, selected: {rows}'
+        raise TimeoutException(f"Timed out after {timeout}s while waiting for {condition} in {root}. {state}")
+    return rows
+
 
 class Row(BaseElement):
     def __init__(self, root: Element, cell_locators: Dict[str, CSS_or_XPATH]):
@@ -35,9 +169,7 @@ class Row(BaseElement):
 
     @allure.step("Extracting data from the row")
     def _parse_values(self):
-        for field_name, locator in self.cell_locators.items():
-            self._container.element(locator).should(have._not_.exact_text(""))
-            self._values[field_name] = self._container.element(locator).get(query.text)
+        [(_, self._values)] = take_snapshot(self._container, None, self.cell_locators)
 
     @property
     def values(self) -> dict:
@@ -93,6 +225,7 @@ class Table(BaseElement, Generic[R]):
         self._container = root
         self._cell_locators = locators_dict
         self.body = self._container
+        self._row_locator = row_locator
         self.rows = self._container.all(row_locator)
         self.header = self._container.element(table_header_locator)
         self.header_cells = self.header.all(header_cell_locator)
@@ -102,12 +235,22 @@ class Table(BaseElement, Generic[R]):
     def cell_locators(self):
         return self._cell_locators
 
+    @report.step
+    def snapshot(self, column_name=None, value=None) -> List[dict]:
+        """Values of all rows, or of the rows having the value in the column, read in one call to the browser.
+        It waits for all cells of the rows to have text, like Row.values does, and for a row having the value"""
+        filter_by = (column_name, value) if column_name is not None else None
+        return [values for _, values in take_snapshot(self.body, self._row_locator, self.cell_locators, filter_by)]
+
     @report.step
     def get_row_by_cell_value(self, column_name, value) -> R:
-        filtered_rows = self.rows.by_their(self.cell_locators[column_name], have.text(value))
-        filtered_rows.should(have.size(1))
+        take_snapshot(self.body, self._row_locator, self.cell_locators, (column_name, value), wait_for="single")
+        # the row is located by its value every time, so it follows re-rendering of the table
         return (
-            self.row_type(filtered_rows.first, cell_locators=self.cell_locators)
+            self.row_type(
+                rows_by_cell_text(self.body, self._row_locator, self.cell_locators[column_name], value),
+                cell_locators=self.cell_locators,
+            )
             .as_(f'row_with_"{column_name}"="{value}"')
             .set_previous_name_chain_element(self)
         )
@@ -125,8 +268,11 @@ class Table(BaseElement, Generic[R]):
 
     @report.step
     def is_row_presented(self, column_name, value) -> bool:
-        result = self.rows.by_their(self.cell_locators[column_name], have.text(value))
-        return bool(result)
+        return bool(
+            self.body.config.driver.execute_script(
+                FIND_ROWS_SCRIPT, self.body(), self._row_locator, self.cell_locators[column_name], value
+            )
+        )
 
     @property
     def last_remaining_row(self) -> R:
@@ -0,0 +1,184 @@
+"""
+Measures what the framework adds on top of the network in the API stack: request preparation, allure steps, response
+recording and parsing of models. Requests are served in memory by the local fake stand (core/api/fake_stand.py), so
+network time does not hide the overhead.
+
+    STAND=local python -m scripts.benchmark_api_stack [--iterations 200] [--save-baseline] [--tolerance 0.25]
+
+Building blocks (prepare_body, parsing, allure steps, recording) are measured on their own, whole wrapper calls include
+the CPU time of requests and of the fake stand too.
+CPU time (time.process_time) and the peak of allocated memory (tracemalloc) are reported per call. The results are
+compared with the baseline saved by --save-baseline on the same machine, and the script fails if a case got slower
+or allocates more than the tolerance allows.
+"""
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import allure
+
+from core.api.base_api import prepare_body as prepare_lms_body
+from core.api.base_refactored.api_client import prepare_body
+from core.api.decoding import parse_response
+from core.api.fake_stand import fake_stand
+from core.api.labs.lab import LabsManager
+from core.api.labs.workspace_configuration import WorkspaceConfigurationsManager
+from core.api.lms.activity import ActivityApi
+from core.api.session_manager import SessionManager
+from core.models.labs.lab import LabInput
+from core.models.lms.activity import Activity, ActivityState, ActivityType, CreateActivity
+from core.models.query import LoadOptions, QueryResponse
+from settings import PROJECT_ROOT, Environment, settings
+from util.api.allure_reporting import api_calls_buffer, prettify_dict, record_response
+
+logger = logging.getLogger("benchmark_api_stack")
+
+DEFAULT_BASELINE_PATH = PROJECT_ROOT / ".cache" / "benchmarks" / "api_stack.json"
+WARMUP_ITERATIONS = 5
+# tracemalloc slows calls down a lot, so allocations are measured on fewer calls than the CPU time
+ALLOCATION_ITERATIONS = 20
+QUERY_PAGE_SIZE = 50
+
+
+class BenchmarkResult(NamedTuple):
+    cpu_us: float
+    alloc_kib: float
+
+
+def measure(call: Callable[[], Any], iterations: int) -> BenchmarkResult:
+    for _ in range(WARMUP_ITERATIONS):
+        call()
+
+    started_at = time.process_time()
+    for _ in range(iterations):
+        call()
+    cpu_seconds = (time.process_time() - started_at) / iterations
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(iterations, ALLOCATION_ITERATIONS)):
+            tracemalloc.reset_peak()
+            allocated_before, _ = tracemalloc.get_traced_memory()
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - allocated_before)
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(cpu_us=cpu_seconds * 1e6, alloc_kib=statistics.median(peaks) / 1024)
+
+
+def build_cases() -> dict[str, Callable[[], Any]]:
+    session_manager = SessionManager()
+    labs_session = session_manager.get_session(next(iter(settings.stand_config.labs_users)))
+    lms_session = session_manager.get_session(next(iter(settings.stand_config.platform_users)))
+
+    workspace_configuration = WorkspaceConfigurationsManager(labs_session).create()
+    labs_manager = LabsManager(labs_session)
+    lab = labs_manager.create(LabInput(workspace_configuration=workspace_configuration.id))
+    lab_input = LabInput(workspace_configuration=workspace_configuration.id)
+    lab_response = lab.api.request_get()
+    lab_data = lab_response.json()
+
+    activity_api = ActivityApi(lms_session)
+    create_activity = CreateActivity(resource_library_id="benchmark", state=ActivityState.DRAFT, type=ActivityType.TEXT)
+    activities = [activity_api.post(create_activity) for _ in range(QUERY_PAGE_SIZE)]
+    activity_response = activity_api.request_get(activities[0].id)
+    query_response = activity_api.request_query(LoadOptions(take=QUERY_PAGE_SIZE))
+
+    def get_lab():
+        lab.conditional_headers = {}
+        lab.fetch_data()
+
+    def step():
+        with allure.step(f"getting {lab.api}"):
+            pass
+
+    def record():
+        record_response(lab_response)
+        api_calls_buffer.clear()
+
+    return {
+        # building blocks
+        "prepare_body LabInput": lambda: prepare_body(lab_input),
+        "prepare_body CreateActivity": lambda: prepare_lms_body(create_activity),
+        "prettify_dict LabDetailed": lambda: prettify_dict(lab_data),
+        "allure.step": step,
+        "record_response": record,
+        "_update_inner_data LabDetailed": lambda: lab._update_inner_data(lab_response),
+        "parse Activity": lambda: parse_response(activity_response, Activity),
+        "parse QueryResponse[Activity]": lambda: parse_response(query_response, QueryResponse[Activity]),
+        # whole calls of the wrappers
+        "get LabDetailed": get_lab,
+        "get LabDetailed, not modified": lab.fetch_data,
+        "create LabDetailed": lambda: labs_manager.create(lab_input),
+        "patch LabDetailed": lambda: lab.patch({"name": lab_input.name}),
+        "get Activity": lambda: activity_api.get(activities[0].id),
+        "create Activity": lambda: activity_api.post(create_activity),
+        "query QueryResponse[Activity]": lambda: activity_api.query(LoadOptions(take=QUERY_PAGE_SIZE)),
+    }
+
+
+def compare(results: dict[str, BenchmarkResult], baseline: dict[str, dict[str, float]], tolerance: float) -> list[str]:
+    """Prints the results next to the baseline and returns the regressed cases"""
+    regressions = []
+    print(f"{'case':<36}{'cpu, us':>12}{'baseline':>12}{'alloc, KiB':>12}{'baseline':>12}")
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            print(f"{name:<36}{result.cpu_us:>12.1f}{'-':>12}{result.alloc_kib:>12.1f}{'-':>12}")
+            continue
+
+        regressed = [
+            metric for metric in BenchmarkResult._fields if getattr(result, metric) > expected[metric] * (1 + tolerance)
+        ]
+        mark = f"  REGRESSION: {', '.join(regressed)}" if regressed else ""
+        print(
+            f"{name:<36}{result.cpu_us:>12.1f}{expected['cpu_us']:>12.1f}"
+            f"{result.alloc_kib:>12.1f}{expected['alloc_kib']:>12.1f}{mark}"
+        )
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Framework overhead of the API stack")
+    parser.add_argument("--iterations", type=int, default=200, help="calls per case")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth of a metric")
+    args = parser.parse_args()
+
+    if settings.stand != Environment.LOCAL or not settings.fake_stand_in_process:
+        raise RuntimeError("The benchmark runs against the in-process fake stand only: set STAND=local")
+
+    logging.basicConfig(level=logging.WARNING)
+    # the overhead only: no latency, errors or delayed commands
+    fake_stand.latency = fake_stand.error_rate = fake_stand.command_failure_rate = fake_stand.transition_seconds = 0
+    results = {name: measure(call, args.iterations) for name, call in build_cases().items()}
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({name: result._asdict() for name, result in results.items()}, indent=2))
+        logger.warning(f"The baseline is saved to {args.baseline}")
+        return 0
+
+    if regressions:
+        logger.error(f"Regressed cases: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
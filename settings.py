@@ -6,13 +6,14 @@ from typing import Any
 from urllib.parse import urljoin
 
 import requests
-from pydantic import BaseSettings, root_validator
+from pydantic import BaseModel, BaseSettings, root_validator
 
 from test_data.stand_config import (
     CUSTOM_DOMAIN_DEV_CONFIG,
     CUSTOM_DOMAIN_STAGE_CONFIG,
     CUSTOM_DOMAIN_TEST_CONFIG,
     DEV_CONFIG,
+    LOCAL_CONFIG,
     PROD_CONFIG,
     STAGE_CONFIG,
     TEST_CONFIG,
@@ -32,6 +33,8 @@ class Environment(StrEnum):
     CUSTOM_DEVELOPMENT = "custom_dev"
     CUSTOM_TEST = "custom_test"
     CUSTOM_STAGING = "custom_stage"
+    # the fake backends of core/api/fake_stand.py
+    LOCAL = "local"
 
 
 ENVIRONMENT_BASE_URLS = {
@@ -42,8 +45,58 @@ ENVIRONMENT_BASE_URLS = {
     Environment.CUSTOM_DEVELOPMENT: "https://cldev-dummy-tenant.alemira.dev/",
     Environment.CUSTOM_TEST: "https://dummy-tenant-for-test.alemira.dev/",
     Environment.CUSTOM_STAGING: "https://clstage-dummy-tenant.alemira.dev/",
+    Environment.LOCAL: "http://localhost:8765/",
 }
 
+
+class HttpBackend(StrEnum):
+    DEFAULT = "default"
+    IDENTITY = "identity"
+    LABS = "labs"
+    LMS = "lms"
+    SCORM = "scorm"
+    PLATFORM = "platform"
+
+
+class ApiRecordingMode(StrEnum):
+    # every API call is attached to the allure report as it happens
+    FULL = "full"
+    # API calls are kept in a bounded buffer and attached only when a test fails
+    ON_FAILURE = "on_failure"
+
+
+class AllureReportingLevel(StrEnum):
+    # every step is written to the report
+    FULL = "full"
+    # repeated identical sibling steps are merged into one with a count and their total duration
+    COLLAPSED = "collapsed"
+    # steps and attachments are written for failed and broken tests only, and for fixtures used by them
+    FAILURE_ONLY = "failure_only"
+
+
+class UiLoginMode(StrEnum):
+    # the IdP login form is filled in the browser
+    FORM = "form"
+    # the login is emulated over HTTP and its cookies are set to the browser
+    COOKIES = "cookies"
+
+
+class CassetteMode(StrEnum):
+    OFF = "off"
+    # API calls of every test are written to a cassette
+    RECORD = "record"
+    # API calls are served from cassettes without network
+    REPLAY = "replay"
+
+
+class HttpConnectionSettings(BaseModel):
+    pool_maxsize: int = 32
+    max_retries: int = 3
+    retry_backoff_factor: float = 0.5
+    keep_alive: bool = True
+    compression: bool = True
+
+
 ENVIRONMENT_IDENTITY_BASE_URLS = {Environment.PRODUCTION: "https://idp.constructor.app/"}
 
 ENVIRONMENT_STAND_CONFIGS = {
@@ -54,6 +107,7 @@ ENVIRONMENT_STAND_CONFIGS = {
     Environment.CUSTOM_DEVELOPMENT: CUSTOM_DOMAIN_DEV_CONFIG,
     Environment.CUSTOM_TEST: CUSTOM_DOMAIN_TEST_CONFIG,
     Environment.CUSTOM_STAGING: CUSTOM_DOMAIN_STAGE_CONFIG,
+    Environment.LOCAL: LOCAL_CONFIG,
 }
 
 
@@ -61,7 +115,11 @@ class Settings(BaseSettings):
     # common settings section:
     debug: bool = False
     stand: Environment = Environment.STAGING
+    # in bytes, arguments of assertions are rendered up to these limits for step titles and for attachments of failures
     assertpy_argument_length_limit: int = 50
+    assertpy_attachment_size_limit: int = 64 * 1024
+    # size of allure results of long runs, see util/allure_steps.py
+    allure_reporting_level: AllureReportingLevel = AllureReportingLevel.FULL
 
     # urls settings section:
     base_url: str = ""
@@ -100,9 +158,60 @@ class Settings(BaseSettings):
     chrome_path: str | None = None
     default_browser_name: str = "default_browser"
     recheck_timeout: float = 3.0
+    # how login_user logs in, see core/fixture_generators/auth.py
+    ui_login_mode: UiLoginMode = UiLoginMode.FORM
+    # login cookies are cached for this time if the stand doesn't set their expiration
+    login_cookies_lifetime: float = 1800.0
+    # cookies and web storage of the first login of a user are restored by later logins, see
+    # core/fixture_generators/storage_state.py
+    storage_state_enabled: bool = False
+    storage_state_dir: str = str(PROJECT_ROOT / ".cache" / "storage_state")
+    # started drivers kept per worker and reset between browser sessions instead of quitting, 0 disables the pool.
+    # Idle pooled drivers are open browsers, on a grid they count against the session quota
+    browser_pool_size: int = 0
 
     # API settings section:
     default_api_timeout: float = 30.0
+    token_cache_enabled: bool = True
+    token_cache_dir: str = str(PROJECT_ROOT / ".cache" / "tokens")
+    token_refresh_margin: float = 60.0
+    default_token_lifetime: float = 3600.0
+    api_max_concurrent_requests: int = 8
+    # per backend connection settings, e.g. HTTP_CONNECTIONS='{"labs": {"pool_maxsize": 32}}'
+    http_connections: dict[HttpBackend, HttpConnectionSettings] = {}
+    api_recording_mode: ApiRecordingMode = ApiRecordingMode.FULL
+    # the oldest API calls of a test are dropped when their raw requests and responses exceed this size
+    api_recording_buffer_size: int = 4 * 1024 * 1024
+    # record/replay of API calls, see core/api/cassette.py
+    api_cassette_mode: CassetteMode = CassetteMode.OFF
+    api_cassette_dir: str = str(PROJECT_ROOT / "cassettes")
+    # stand-wide reference data (resource libraries, roles, networks...) is cached, see core/api/reference_cache.py
+    reference_cache_enabled: bool = False
+    reference_cache_ttl: float = 300.0
+    reference_cache_max_entries: int = 256
+    # share cached reference data between xdist workers and runs
+    reference_cache_persist: bool = False
+    reference_cache_dir: str = str(PROJECT_ROOT / ".cache" / "reference")
+
+    # local stand settings section, see core/api/fake_stand.py:
+    # requests are handled in process, otherwise they are sent to `python -m core.api.fake_stand`
+    fake_stand_in_process: bool = True
+    fake_stand_latency: float = 0.0
+    fake_stand_error_rate: float = 0.0
+    fake_stand_error_status: int = 503
+    fake_stand_command_failure_rate: float = 0.0
+    # delay of command completions and of state changes of sessions, vms and images
+    fake_stand_transition_seconds: float = 0.0
+    fake_stand_seed: int = 0
+
+    # polling settings section:
+    polling_min_delay: float = 0.2
+    polling_max_delay: float = 5.0
+    polling_backoff_factor: float = 1.5
+    polling_jitter: float = 0.2
+    # the first poll happens after this part of the typical time-to-ready of an operation
+    polling_first_delay_ratio: float = 0.8
+    polling_timings_file: str = str(PROJECT_ROOT / ".cache" / "polling_timings.json")
 
     # labs settings section:
     code_server_starting_timeout: float = 80.0
@@ -182,6 +291,23 @@ class Settings(BaseSettings):
             url = ""
         return url
 
+    @property
+    def http_backend_urls(self) -> dict[HttpBackend, str]:
+        return {
+            HttpBackend.IDENTITY: self.base_url_identity,
+            HttpBackend.LABS: self.base_url_labs,
+            HttpBackend.LMS: self.base_url_lms_api,
+            HttpBackend.SCORM: self.base_url_scorm_api,
+            HttpBackend.PLATFORM: self.base_url_platform_api,
+        }
+
+    def http_connection_settings(self, backend: HttpBackend) -> HttpConnectionSettings:
+        return (
+            self.http_connections.get(backend)
+            or self.http_connections.get(HttpBackend.DEFAULT)
+            or HttpConnectionSettings()
+        )
+
     @property
     def stand_config(self) -> StandConfig:
         return ENVIRONMENT_STAND_CONFIGS[self.stand]
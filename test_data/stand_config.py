@@ -47,6 +47,12 @@ DEV_CONFIG = StandConfig(
     platform_users=DEFAULT_DOMAIN_USERS,
     labs_users=DEFAULT_LABS_USERS,
 )
+LOCAL_CONFIG = StandConfig(
+    tenant_id=DEFAULT_TENANT_ID,
+    team_id=DEFAULT_TEAM_ID,
+    platform_users=DEFAULT_DOMAIN_USERS,
+    labs_users=DEFAULT_LABS_USERS,
+)
 
 PROD_CONFIG = StandConfig(
     tenant_id=DEFAULT_TENANT_ID,
@@ -133,16 +133,37 @@ def guest_link(instant_session):
     return guest_link
 
 
+# guest fixtures: (browser name, participant name)
+GUESTS = {
+    "guest_session": ("second_browser", "Guest participant"),
+    "second_guest": ("third_browser", "Third participant"),
+}
+
+
+def join_as_guest(selene_browser: Browser, guest_link: str, participant_name: str) -> InstantSessionPage:
+    selene_browser.open(guest_link)
+    session = InstantSessionPage(selene_browser)
+    session.participant_name_input.set_value(participant_name)
+    session.disable_video()
+    session.mic_button.click()
+    session.start_session_button.click()
+    session.participant_video.should(be.visible)
+    return session
+
+
 @pytest.fixture()
-def guest_session(guest_link, second_browser):
-    second_browser.open(guest_link)
-    guest_session = InstantSessionPage(second_browser)
-    guest_session.participant_name_input.set_value("Guest participant")
-    guest_session.disable_video()
-    guest_session.mic_button.click()
-    guest_session.start_session_button.click()
-    guest_session.participant_video.should(be.visible)
-    return guest_session
+def guest_browsers(request, start_secondary_browsers) -> dict[str, Browser]:
+    """
+    Browsers of all guests requested by a test, started at the same time
+    """
+    guests = [fixture for fixture in GUESTS if fixture in request.fixturenames]
+    browsers = start_secondary_browsers(*(GUESTS[fixture][0] for fixture in guests))
+    return dict(zip(guests, browsers))
+
+
+@pytest.fixture()
+def guest_session(guest_link, guest_browsers) -> InstantSessionPage:
+    return join_as_guest(guest_browsers["guest_session"], guest_link, GUESTS["guest_session"][1])
 
 
 @pytest.fixture()
@@ -164,12 +185,9 @@ def setup_presenter_role(instant_session, guest_session):
 
 
 @pytest.fixture()
-def second_guest(guest_link, third_browser):
-    third_browser.open(guest_link)
-    session = InstantSessionPage(third_browser)
-    session.participant_name_input.set_value("Third participant")
-    session.disable_video()
-    session.mic_button.click()
-    session.start_session_button.click()
-    session.participant_video.should(be.visible)
-    return session
+def second_guest(request, guest_link, guest_session, guest_browsers) -> InstantSessionPage:
+    # the role menu is of the first member of the role group, so the role is given while the first guest is alone
+    for role_setup in ("setup_moderator_role", "setup_presenter_role"):
+        if role_setup in request.fixturenames:
+            request.getfixturevalue(role_setup)
+    return join_as_guest(guest_browsers["second_guest"], guest_link, GUESTS["second_guest"][1])
@@ -2,11 +2,11 @@ import gzip
 import json
 import logging
 import os
+from contextlib import ExitStack
 
 import allure
 import pytest
 import requests
-import waiting
 from requests import HTTPError
 from selene import Browser, browser
 from waiting import TimeoutExpired
@@ -14,8 +14,15 @@ from waiting import TimeoutExpired
 from core.api.base_refactored.api_wrapper import ApiWrapper
 from core.api.session_manager import SessionManager
 from core.fixture_generators.auth import login_user
-from core.fixture_generators.driver import BrowserSessionsManager, setup_default_browser, setup_secondary_browser
+from core.fixture_generators.driver import (
+    BrowserSessionsManager,
+    driver_pool_from,
+    setup_default_browser,
+    setup_secondary_browser,
+    setup_secondary_browsers,
+)
 from settings import settings
+from util.polling import wait_for
 from util.web.assist.selene.report.report import add_reporting_to_selene_steps
 
 
@@ -34,9 +41,11 @@ def session_manager() -> SessionManager:
 def browser_sessions_manager() -> BrowserSessionsManager:
     """
     The fixture is used to track and manage all active browser sessions.
+    Their drivers are leased from a pool of warm drivers, see settings.browser_pool_size.
     """
-    manager = BrowserSessionsManager()
+    manager = BrowserSessionsManager(driver_pool_from(settings) if settings.browser_pool_size else None)
     yield manager
+    manager.close()
 
 
 @pytest.fixture(scope="session")
@@ -118,10 +127,11 @@ def global_teardown_bucket():
                     raise error
 
     try:
-        waiting.wait(
+        wait_for(
             lambda: all(el.is_finalized for el in bucket),
+            operation="global teardown",
             on_poll=try_to_delete_all_items,
-            sleep_seconds=5,
+            max_delay=5,
             timeout_seconds=max_timeout,
             waiting_for="until all items will be finalized",
             expected_exceptions=(HTTPError, KeyError),
@@ -164,6 +174,26 @@ def third_browser(browser_sessions_manager):
         yield selene_browser
 
 
+@pytest.fixture()
+def start_secondary_browsers(browser_sessions_manager):
+    """
+    Starts several browser instances at the same time, they are finished with the test.
+
+    Returns: a function starting browsers with the given names and returning them in the same order
+
+    """
+    with ExitStack() as stack:
+
+        def start(*browser_names: str) -> list[Browser]:
+            return stack.enter_context(
+                setup_secondary_browsers(
+                    settings, sessions_manager=browser_sessions_manager, browser_names=browser_names
+                )
+            )
+
+        yield start
+
+
 @pytest.fixture(scope="function")
 def save_chrome_logs(default_browser, request, worker_name):
     """
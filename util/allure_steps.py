@@ -0,0 +1,154 @@
+"""
+Reporting levels of allure steps, see settings.allure_reporting_level.
+
+Every selene command (wait_with), report.step and assertpy assertion is a step, so results of long UI runs get huge.
+allure-pytest keeps the steps of a test in memory until the test is finished, so they are reduced right before the
+test result is written by the allure file logger. Steps of fixtures are reduced the same way before their container is
+written, in the failure only mode they are kept when any test using the fixture fails.
+
+Titles and params of report.step steps are rendered here too, only for the steps which are kept.
+"""
+import logging
+from itertools import groupby
+from pathlib import Path
+
+import allure_commons
+from allure_commons import plugin_manager
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import Attachment, ExecutableItem, Status, TestResult, TestResultContainer, TestStepResult
+
+from settings import AllureReportingLevel, settings
+from util.web.assist.allure.report import Rendered
+
+REPORTED_STATUSES = (Status.FAILED, Status.BROKEN)
+
+
+def _signature(step: TestStepResult) -> tuple:
+    return (
+        step.name,
+        step.status,
+        tuple((parameter.name, parameter.value) for parameter in step.parameters),
+        tuple(_signature(child) for child in step.steps),
+    )
+
+
+def _duration(step: TestStepResult) -> int:
+    if step.start is None or step.stop is None:
+        return 0
+    return step.stop - step.start
+
+
+def collapse_steps(steps: list[TestStepResult]) -> list[TestStepResult]:
+    """Merges repeated identical sibling steps into the first of them, steps with attachments are never merged"""
+    for step in steps:
+        step.steps = collapse_steps(step.steps)
+
+    collapsed = []
+    for _, group in groupby(steps, key=lambda step: id(step) if step.attachments else _signature(step)):
+        first, *repeated = group
+        if repeated:
+            total_duration = _duration(first) + sum(_duration(step) for step in repeated)
+            first.name = f"{first.name} (x{len(repeated) + 1})"
+            if first.start is not None:
+                first.stop = first.start + total_duration
+        collapsed.append(first)
+    return collapsed
+
+
+def render_steps(steps: list[TestStepResult]):
+    """Renders titles and params of the steps which were postponed by report.step"""
+    for step in steps:
+        if isinstance(step.name, Rendered):
+            step.name = str(step.name)
+        for parameter in step.parameters:
+            if isinstance(parameter.value, Rendered):
+                parameter.value = str(parameter.value)
+        render_steps(step.steps)
+
+
+def _attachments(items: list[ExecutableItem]) -> list[Attachment]:
+    """Attachments of the items and of all their steps"""
+    attachments = []
+    for item in items:
+        attachments.extend(item.attachments)
+        attachments.extend(_attachments(item.steps))
+    return attachments
+
+
+def _live_test(test_uuid: str) -> TestResult | None:
+    """A test allure-pytest hasn't reported yet, e.g. the one whose function fixtures are being finalized"""
+    for plugin in plugin_manager.get_plugins():
+        if allure_logger := getattr(plugin, "allure_logger", None):
+            if (test := allure_logger.get_item(test_uuid)) is not None:
+                return test
+    return None
+
+
+class AllureStepsReducer:
+    """
+    Applies the reporting level to test results before they are written
+    """
+
+    def __init__(self, level: AllureReportingLevel):
+        self.level = level
+        self._reported_tests: set[str] = set()
+
+    def install(self):
+        # installed at every level, the postponed titles of steps are rendered by it
+        if not plugin_manager.is_registered(self):
+            plugin_manager.register(self)
+
+    @allure_commons.hookimpl(tryfirst=True)
+    def report_result(self, result: TestResult):
+        if self.level == AllureReportingLevel.FAILURE_ONLY:
+            if result.status in REPORTED_STATUSES:
+                self._reported_tests.add(result.uuid)
+            else:
+                self._prune([result])
+        render_steps(result.steps)
+        if self.level == AllureReportingLevel.COLLAPSED:
+            result.steps = collapse_steps(result.steps)
+
+    @allure_commons.hookimpl(tryfirst=True)
+    def report_container(self, container: TestResultContainer):
+        fixtures = [*container.befores, *container.afters]
+        if self.level == AllureReportingLevel.FAILURE_ONLY and not self._is_reported(container):
+            self._prune(fixtures)
+        for fixture in fixtures:
+            render_steps(fixture.steps)
+            if self.level == AllureReportingLevel.COLLAPSED:
+                fixture.steps = collapse_steps(fixture.steps)
+
+    def _is_reported(self, container: TestResultContainer) -> bool:
+        """A fixture is reported when it fails or any test using it fails, the tests may still be running"""
+        if any(fixture.status in REPORTED_STATUSES for fixture in [*container.befores, *container.afters]):
+            return True
+        for test_uuid in container.children:
+            if test_uuid in self._reported_tests:
+                return True
+            test = _live_test(test_uuid)
+            if test is not None and test.status not in (Status.PASSED, Status.SKIPPED):
+                return True
+        return False
+
+    def _prune(self, items: list[ExecutableItem]):
+        # attachments are written as soon as they are attached
+        self._remove_attachment_files(_attachments(items))
+        for item in items:
+            item.steps = []
+            item.attachments = []
+
+    @staticmethod
+    def _remove_attachment_files(attachments: list[Attachment]):
+        report_dirs = [
+            Path(plugin._report_dir) for plugin in plugin_manager.get_plugins() if isinstance(plugin, AllureFileLogger)
+        ]
+        for attachment in attachments:
+            for report_dir in report_dirs:
+                try:
+                    (report_dir / attachment.source).unlink(missing_ok=True)
+                except OSError:
+                    logging.warning(f"failed to remove attachment {attachment.source} from {report_dir}")
+
+
+allure_steps_reducer = AllureStepsReducer(level=settings.allure_reporting_level)
@@ -1,10 +1,15 @@
 import json
+import threading
+from collections import deque
 from collections.abc import Mapping
+from typing import NamedTuple
 
 import allure
 from allure_commons.types import AttachmentType
 from requests import PreparedRequest, Response
 
+from settings import ApiRecordingMode, settings
+
 
 def prettify_dict(value: Mapping) -> str:
     """
@@ -13,31 +18,129 @@ def prettify_dict(value: Mapping) -> str:
     return json.dumps(value, indent=4)
 
 
-def attach_request_data(request: PreparedRequest):
-    with allure.step("Request"):
-        allure.attach(request.url, name="url", attachment_type=AttachmentType.URI_LIST)
-        allure.attach(prettify_dict(dict(request.headers)), name="headers", attachment_type=AttachmentType.JSON)
+def _to_bytes(body: bytes | str | None) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode()
+    if isinstance(body, bytes):
+        return body
+    # a streamed body (e.g. a file upload) can't be read again
+    return f"<{type(body).__name__} body>".encode()
+
+
+class ApiCall(NamedTuple):
+    """
+    Raw data of a request and its response, rendered for the report only when it is attached
+    """
+
+    method: str
+    url: str
+    request_headers: dict[str, str]
+    request_body: bytes
+    status_code: int
+    response_headers: dict[str, str]
+    response_body: bytes
 
-        if "application/json" in request.headers.get("content-type", ""):
-            allure.attach(prettify_dict(json.loads(request.body)), name="json", attachment_type=AttachmentType.JSON)
-        elif request.body:
-            allure.attach(request.body, name="body")
+    @classmethod
+    def from_response(cls, response: Response) -> "ApiCall":
+        request: PreparedRequest = response.request
+        return cls(
+            method=request.method,
+            url=request.url,
+            request_headers=dict(request.headers),
+            request_body=_to_bytes(request.body),
+            status_code=response.status_code,
+            response_headers=dict(response.headers),
+            response_body=response.content or b"",
+        )
 
+    @property
+    def size(self) -> int:
+        return len(self.request_body) + len(self.response_body)
 
-def attach_response_data(response: Response):
+
+def _attach_body(body: bytes, headers: Mapping[str, str]):
+    if "application/json" in headers.get("content-type", ""):
+        try:
+            allure.attach(prettify_dict(json.loads(body)), name="json", attachment_type=AttachmentType.JSON)
+            return
+        except ValueError:
+            pass
+    if body:
+        allure.attach(body.decode(errors="replace"), name="text")
+
+
+def attach_request_data(api_call: ApiCall):
+    with allure.step("Request"):
+        allure.attach(api_call.url, name="url", attachment_type=AttachmentType.URI_LIST)
+        allure.attach(prettify_dict(api_call.request_headers), name="headers", attachment_type=AttachmentType.JSON)
+        _attach_body(api_call.request_body, _lower_keys(api_call.request_headers))
+
+
+def attach_response_data(api_call: ApiCall):
     with allure.step("Response"):
-        allure.attach(str(response.status_code), name="status code")
-        allure.attach(prettify_dict(dict(response.headers)), name="headers", attachment_type=AttachmentType.JSON)
+        allure.attach(str(api_call.status_code), name="status code")
+        allure.attach(prettify_dict(api_call.response_headers), name="headers", attachment_type=AttachmentType.JSON)
+        _attach_body(api_call.response_body, _lower_keys(api_call.response_headers))
+
+
+def _lower_keys(headers: Mapping[str, str]) -> dict[str, str]:
+    return {key.lower(): value for key, value in headers.items()}
+
+
+def attach_api_call(api_call: ApiCall):
+    with allure.step(f"API call {api_call.method}"):
+        attach_request_data(api_call)
+        attach_response_data(api_call)
+
+
+class ApiCallsBuffer:
+    """
+    Keeps the latest API calls of the current test within max_size bytes of raw request and response bodies.
+    Nothing is rendered until the calls are attached, so passing tests cost only a copy of the raw data.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._calls: deque[ApiCall] = deque()
+        self._size = 0
+        self._dropped = 0
+
+    def add(self, api_call: ApiCall):
+        with self._lock:
+            self._calls.append(api_call)
+            self._size += api_call.size
+            while self._size > self.max_size and len(self._calls) > 1:
+                self._size -= self._calls.popleft().size
+                self._dropped += 1
+
+    def clear(self):
+        with self._lock:
+            self._calls.clear()
+            self._size = 0
+            self._dropped = 0
+
+    def attach(self):
+        with self._lock:
+            calls, dropped = list(self._calls), self._dropped
+        if not calls:
+            return
+
+        title = f"API calls ({dropped} earlier calls are not recorded)" if dropped else "API calls"
+        with allure.step(title):
+            for api_call in calls:
+                attach_api_call(api_call)
+
 
-        if "application/json" in response.headers.get("content-type", ""):
-            allure.attach(prettify_dict(response.json()), name="json", attachment_type=AttachmentType.JSON)
-        elif response.text:
-            allure.attach(response.text, name="text")
+api_calls_buffer = ApiCallsBuffer(max_size=settings.api_recording_buffer_size)
 
 
 def record_response(response: Response, *args, **kwargs):
-    request = response.request
+    api_call = ApiCall.from_response(response)
 
-    with allure.step(f"API call {response.request.method}"):
-        attach_request_data(request)
-        attach_response_data(response)
+    if settings.api_recording_mode == ApiRecordingMode.FULL:
+        attach_api_call(api_call)
+    else:
+        api_calls_buffer.add(api_call)
@@ -1,13 +1,117 @@
-from functools import wraps
-from typing import List
+from collections.abc import Hashable, Iterator
+from functools import cache, wraps
+from typing import Any, List
 
 import allure
+from assertpy import assertpy as assertpy_module
 from assertpy.assertpy import AssertionBuilder
 from pydantic import BaseModel
 
 from settings import settings
 
 
+class _LimitReached(Exception):
+    pass
+
+
+def _rendered_parts(value: Any, as_repr: bool) -> Iterator[str]:
+    """Yields the parts of str(value) (repr(value) for items of collections) one by one"""
+    if type(value) in (list, tuple):
+        opening, closing = ("[", "]") if isinstance(value, list) else ("(", ",)" if len(value) == 1 else ")")
+        yield opening
+        for index, item in enumerate(value):
+            if index:
+                yield ", "
+            yield from _rendered_parts(item, as_repr=True)
+        yield closing
+    elif type(value) is dict:
+        yield "{"
+        for index, (key, item) in enumerate(value.items()):
+            if index:
+                yield ", "
+            yield repr(key)
+            yield ": "
+            yield from _rendered_parts(item, as_repr=True)
+        yield "}"
+    elif isinstance(value, BaseModel):
+        if as_repr:
+            yield f"{value.__repr_name__()}("
+        for index, (name, field_value) in enumerate(value.__repr_args__()):
+            if index:
+                yield ", " if as_repr else " "
+            if name is not None:
+                yield f"{name}="
+            yield from _rendered_parts(field_value, as_repr=True)
+        if as_repr:
+            yield ")"
+    else:
+        yield repr(value) if as_repr else str(value)
+
+
+def render_limited(value: Any, limit: int, separator: str | None = None) -> str:
+    """
+    Renders str(value) up to limit bytes, collections and models are rendered item by item, so the rest is never
+    stringified. With a separator, value is a sequence of arguments rendered as separator.join(map(str, value))
+    """
+    rendered = bytearray()
+
+    def append(part: str):
+        rendered.extend(part.encode())
+        if len(rendered) > limit:
+            raise _LimitReached
+
+    try:
+        if separator is None:
+            for part in _rendered_parts(value, as_repr=False):
+                append(part)
+        else:
+            for index, item in enumerate(value):
+                if index:
+                    append(separator)
+                for part in _rendered_parts(item, as_repr=False):
+                    append(part)
+    except _LimitReached:
+        return rendered[:limit].decode(errors="ignore") + "..."
+    return rendered.decode()
+
+
+@cache
+def _schema_field_names(model_class: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(model_class.schema()["properties"].keys())
+
+
+def _hashable(value: Any) -> Hashable:
+    """A hashable value equal to the other one's if the values are equal, a TypeError is raised for unknown types"""
+    # pydantic models are equal to other models and to dicts with the same .dict()
+    if isinstance(value, BaseModel):
+        value = value.dict()
+    if isinstance(value, dict):
+        return dict, frozenset((key, _hashable(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(_hashable(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset, frozenset(_hashable(item) for item in value)
+    hash(value)
+    return value
+
+
+def _comparison_key(model: BaseModel, fields: list[str]) -> tuple:
+    return tuple(_hashable(getattr(model, attr)) for attr in fields)
+
+
+def _attach_arguments(main_argument: Any, secondary_arguments: tuple):
+    limit = settings.assertpy_attachment_size_limit
+    allure.attach(
+        render_limited(main_argument, limit), name="main argument", attachment_type=allure.attachment_type.TEXT
+    )
+    if secondary_arguments:
+        allure.attach(
+            render_limited(secondary_arguments, limit, separator=" ,"),
+            name="secondary argument",
+            attachment_type=allure.attachment_type.TEXT,
+        )
+
+
 class AssertPyExtensions:
     @staticmethod
     def is_all_items_has_field_equal_to(assertpy_self, field_name, field_value):
@@ -57,7 +161,7 @@ class AssertPyExtensions:
         with allure.step(f"Asserting that models has all fields equal excluding '{excluded_fields or ''}' "):
             excluded_fields = excluded_fields or []
             fields_to_compare = [
-                attr for attr in assertpy_self.val.schema()["properties"].keys() if attr not in excluded_fields
+                attr for attr in _schema_field_names(type(assertpy_self.val)) if attr not in excluded_fields
             ]
             if not all(
                 [getattr(assertpy_self.val, attr) == getattr(expected_model, attr) for attr in fields_to_compare]
@@ -81,16 +185,32 @@ class AssertPyExtensions:
         ):
             excluded_fields = excluded_fields or []
             fields_to_compare = [
-                attr for attr in list_expected_model[0].schema()["properties"].keys() if attr not in excluded_fields
+                attr for attr in _schema_field_names(type(list_expected_model[0])) if attr not in excluded_fields
             ]
 
-            def compare_fields(expected, actual):
-                return all([(getattr(actual, attr) == getattr(expected, attr)) for attr in fields_to_compare])
+            try:
+                actual_keys = [_comparison_key(actual, fields_to_compare) for actual in assertpy_self.val]
+                expected_keys = [_comparison_key(expected, fields_to_compare) for expected in list_expected_model]
+            except TypeError:
+                # a field value can't be hashed, so every pair of models is compared
+                def compare_fields(expected, actual):
+                    return all([(getattr(actual, attr) == getattr(expected, attr)) for attr in fields_to_compare])
+
+                extra = [
+                    item
+                    for item in assertpy_self.val
+                    if not any(compare_fields(expected, item) for expected in list_expected_model)
+                ]
+                missing = [
+                    item
+                    for item in list_expected_model
+                    if not any(compare_fields(expected, item) for expected in assertpy_self.val)
+                ]
+            else:
+                expected_key_set, actual_key_set = set(expected_keys), set(actual_keys)
+                extra = [item for item, key in zip(assertpy_self.val, actual_keys) if key not in expected_key_set]
+                missing = [item for item, key in zip(list_expected_model, expected_keys) if key not in actual_key_set]
 
-            extra = []
-            for item in assertpy_self.val:
-                if not list(filter(lambda expected: compare_fields(expected, item), list_expected_model)):
-                    extra.append(item)
             if extra:
                 assertpy_self.error(
                     "Expected <%s> to contain only %s, but did contain %s."
@@ -101,10 +221,6 @@ class AssertPyExtensions:
                     )
                 )
 
-            missing = []
-            for item in list_expected_model:
-                if not list(filter(lambda expected: compare_fields(expected, item), assertpy_self.val)):
-                    missing.append(item)
             if missing:
                 assertpy_self.error(
                     "Expected <%s> to contain only %s, but did not contain %s."
@@ -135,12 +251,10 @@ class AssertPyExtensions:
         @wraps(func)
         def wrapper(*args):
             limit = settings.assertpy_argument_length_limit
-            main_argument = str(args[0].val)
-            trimmed_main_argument = main_argument[:limit] + "..." if len(main_argument) > limit else main_argument
-            secondary_argument = f'{" ,".join(map(str, args[1::]))}' if len(args) > 1 else ""
-            trimmed_secondary_argument = (
-                secondary_argument[:limit] + "..." if len(secondary_argument) > limit else str(secondary_argument)
-            )
+            main_argument = args[0].val
+            secondary_arguments = args[1::]
+            trimmed_main_argument = render_limited(main_argument, limit)
+            trimmed_secondary_argument = render_limited(secondary_arguments, limit, separator=" ,")
 
             step_description = (
                 f"Asserting that \"{trimmed_main_argument}\" {func.__name__.replace('_', ' ')}"
@@ -148,12 +262,16 @@ class AssertPyExtensions:
             )
 
             with allure.step(step_description):
-                allure.attach(main_argument, name="main argument", attachment_type=allure.attachment_type.TEXT)
-                if secondary_argument:
-                    allure.attach(
-                        secondary_argument, name="secondary argument", attachment_type=allure.attachment_type.TEXT
-                    )
-                return func(*args)
+                # arguments are rendered only for failed assertions, soft ones don't raise but collect the errors
+                soft_errors_count = len(assertpy_module._soft_err)
+                try:
+                    result = func(*args)
+                except BaseException:
+                    _attach_arguments(main_argument, secondary_arguments)
+                    raise
+                if len(assertpy_module._soft_err) > soft_errors_count:
+                    _attach_arguments(main_argument, secondary_arguments)
+                return result
 
         return wrapper
 
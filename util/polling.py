@@ -0,0 +1,198 @@
+"""
+A polling engine for waits on backend operations (commands, state changes, image preparation, teardown).
+
+Polling starts fast and backs off exponentially with jitter up to a maximum delay. A Retry-After header of a polled
+response is honored, and the overall deadline is never exceeded.
+Time-to-ready is recorded per operation type, and the first poll is tuned from those timings: an operation that
+usually takes 20 seconds is not polled every half a second from the very beginning.
+"""
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+from requests import Response
+from waiting.exceptions import TimeoutExpired
+
+from settings import settings
+from util.file_lock import file_lock
+
+T = TypeVar("T")
+
+
+class OperationTimings:
+    """
+    Keeps the latest observed time-to-ready durations per operation type
+    """
+
+    def __init__(self, history_size: int = 20):
+        self.history_size = history_size
+        self._lock = threading.Lock()
+        self._durations: defaultdict[str, deque[float]] = defaultdict(lambda: deque(maxlen=self.history_size))
+        self._new_durations: defaultdict[str, list[float]] = defaultdict(list)
+
+    def record(self, operation: str, seconds: float):
+        with self._lock:
+            self._durations[operation].append(seconds)
+            self._new_durations[operation].append(seconds)
+
+    def typical_duration(self, operation: str) -> float | None:
+        with self._lock:
+            durations = self._durations.get(operation)
+            return statistics.median(durations) if durations else None
+
+    def load(self, path: Path):
+        if not path.exists():
+            return
+        with file_lock(path.with_suffix(".lock")):
+            stored = json.loads(path.read_text() or "{}")
+        with self._lock:
+            for operation, durations in stored.items():
+                self._durations[operation].extend(durations)
+
+    def save(self, path: Path):
+        """Merges timings observed by this process into the file shared by all workers and runs"""
+        with self._lock:
+            new_durations = {operation: list(durations) for operation, durations in self._new_durations.items()}
+            self._new_durations.clear()
+        if not new_durations:
+            return
+
+        with file_lock(path.with_suffix(".lock")):
+            stored = json.loads(path.read_text() or "{}") if path.exists() else {}
+            for operation, durations in new_durations.items():
+                stored[operation] = (stored.get(operation, []) + durations)[-self.history_size :]
+            path.write_text(json.dumps(stored))
+
+
+operation_timings = OperationTimings()
+
+
+def parse_retry_after(response: Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class Poller:
+    """
+    Polls a predicate until it returns a truthy value and returns the value.
+    It is a drop-in replacement for waiting.wait: on_poll is called after each predicate call, exceptions from
+    expected_exceptions are ignored, and waiting.exceptions.TimeoutExpired is raised when the deadline is passed.
+
+    Example:
+        poller = Poller("image is ready", timeout_seconds=300)
+
+        def poll_image():
+            response = api.request_get()
+            poller.honor_retry_after(response)
+            return response if response.json()["is_ready"] else None
+
+        response = poller.wait(poll_image, waiting_for="image to be ready")
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        timeout_seconds: float,
+        min_delay: float | None = None,
+        max_delay: float | None = None,
+        backoff_factor: float | None = None,
+        jitter: float | None = None,
+    ):
+        self.operation = operation
+        self.timeout_seconds = timeout_seconds
+        self.min_delay = settings.polling_min_delay if min_delay is None else min_delay
+        self.max_delay = max(settings.polling_max_delay if max_delay is None else max_delay, self.min_delay)
+        self.backoff_factor = settings.polling_backoff_factor if backoff_factor is None else backoff_factor
+        self.jitter = settings.polling_jitter if jitter is None else jitter
+        self._retry_after: float | None = None
+
+    def honor_retry_after(self, response: Response):
+        """Makes the next delay not shorter than the Retry-After header of the response asks for"""
+        self._retry_after = parse_retry_after(response)
+
+    def _first_delay(self) -> float:
+        typical_duration = operation_timings.typical_duration(self.operation)
+        if typical_duration is None:
+            return self.min_delay
+        return min(max(typical_duration * settings.polling_first_delay_ratio, self.min_delay), self.max_delay)
+
+    def _delays(self, deadline: float) -> Iterator[float]:
+        """Yields delays between polls, never sleeping past the deadline (a time.monotonic() value)"""
+        delay = self._first_delay()
+        while True:
+            jittered_delay = max(delay * random.uniform(1 - self.jitter, 1 + self.jitter), self.min_delay)
+            if self._retry_after is not None:
+                jittered_delay = max(jittered_delay, self._retry_after)
+                self._retry_after = None
+            yield max(min(jittered_delay, deadline - time.monotonic()), 0)
+            delay = min(max(delay, self.min_delay) * self.backoff_factor, self.max_delay)
+
+    def _check(self, predicate: Callable[[], T], on_poll: Callable | None, expected_exceptions) -> T | None:
+        try:
+            result = predicate()
+        except expected_exceptions:
+            return None
+        if result:
+            return result
+        if on_poll is not None:
+            try:
+                on_poll()
+            except expected_exceptions:
+                pass
+        return None
+
+    def _finish(self, started_at: float, polls: int):
+        duration = time.monotonic() - started_at
+        operation_timings.record(self.operation, duration)
+        logging.debug(f'"{self.operation}" was ready in {duration:.2f}s after {polls} polls')
+
+    def wait(
+        self,
+        predicate: Callable[[], T],
+        waiting_for: str,
+        on_poll: Callable | None = None,
+        expected_exceptions: type[Exception] | tuple[type[Exception], ...] = (),
+    ) -> T:
+        started_at = time.monotonic()
+        deadline = started_at + self.timeout_seconds
+        delays = self._delays(deadline)
+        polls = 0
+
+        while True:
+            polls += 1
+            if result := self._check(predicate, on_poll, expected_exceptions):
+                self._finish(started_at, polls)
+                return result
+            if time.monotonic() >= deadline:
+                raise TimeoutExpired(self.timeout_seconds, waiting_for)
+            time.sleep(next(delays))
+
+
+def wait_for(
+    predicate: Callable[[], T],
+    *,
+    operation: str,
+    timeout_seconds: float,
+    waiting_for: str,
+    on_poll: Callable | None = None,
+    expected_exceptions: type[Exception] | tuple[type[Exception], ...] = (),
+    min_delay: float | None = None,
+    max_delay: float | None = None,
+) -> T:
+    """A shortcut for Poller(...).wait(...) for predicates that don't deal with responses directly"""
+    poller = Poller(operation, timeout_seconds=timeout_seconds, min_delay=min_delay, max_delay=max_delay)
+    return poller.wait(predicate, waiting_for=waiting_for, on_poll=on_poll, expected_exceptions=expected_exceptions)
@@ -1,7 +1,7 @@
 import collections
 import inspect
 import re
-from functools import reduce, wraps
+from functools import cache, reduce, wraps
 from typing import Any, Callable, TypeVar
 
 from allure_commons import plugin_manager
@@ -16,8 +16,37 @@ def _humanify(string_with_underscores, /):
     return re.sub(r"_+", " ", string_with_underscores).strip()  # todo: improve ;)
 
 
+@cache
+def _argspec(func) -> inspect.FullArgSpec:
+    return inspect.getfullargspec(func)
+
+
+def is_reporting_enabled() -> bool:
+    """Steps are worth rendering only if somebody listens to them, e.g. allure-pytest with --alluredir"""
+    return bool(plugin_manager.hook.start_step.get_hookimpls())
+
+
+class Rendered:
+    """
+    A step title or param value rendered on first str() call,
+    util/allure_steps.py renders the ones of kept steps right before the test result is written
+    """
+
+    __slots__ = ("_render", "_text")
+
+    def __init__(self, render: Callable[[], str]):
+        self._render = render
+        self._text: str | None = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = self._render()
+            self._render = None
+        return self._text
+
+
 def _fn_params_to_ordered_dict(func, *args, **kwargs):
-    spec = inspect.getfullargspec(func)
+    spec = _argspec(func)
 
     # given pos_or_named = list of pos_only args and pos_or_named/standard args
     pos_or_named_ordered_names = list(spec.args)
@@ -36,6 +65,7 @@ def _fn_params_to_ordered_dict(func, *args, **kwargs):
     )
 
     pos_or_named_or_vargs_or_named_only_ordered_names = pos_or_named_or_vargs_ordered_names + list(spec.kwonlyargs)
+    order = {name: index for index, name in enumerate(pos_or_named_or_vargs_or_named_only_ordered_names)}
 
     items = {
         **pos_without_defaults_dict,
@@ -46,8 +76,8 @@ def _fn_params_to_ordered_dict(func, *args, **kwargs):
     }.items()
 
     sorted_items = sorted(
-        map(lambda kv: (kv[0], represent(kv[1])), items),
-        key=lambda x: pos_or_named_or_vargs_or_named_only_ordered_names.index(x[0]),
+        map(lambda kv: (kv[0], Rendered(lambda value=kv[1]: represent(value))), items),
+        key=lambda x: order[x[0]],
     )
 
     return collections.OrderedDict(sorted_items)
@@ -118,83 +148,92 @@ class StepContext:
         )
 
     def __call__(self, func: _TFunc) -> _TFunc:
+        spec = _argspec(func)
+        is_method_like = bool(spec.args) and spec.args[0] in ["cls", "self"]
+
         @wraps(func)
         def impl(*args, **kw):
             __tracebackhide__ = True
 
+            # titles and params are rendered only for steps which are reported
+            if not is_reporting_enabled():
+                return func(*args, **kw)
+
             # params_dict = func_parameters(func, *args, **kw)
             params_dict = _fn_params_to_ordered_dict(func, *args, **kw)
 
-            def described(item):
-                (name, value) = item
-                spec = inspect.getfullargspec(func)
-                is_pos_or_named_passed_as_arg = name in dict(zip(spec.args, args)).keys()
-                # has_defaults = spec.defaults or spec.kwonlydefaults
-                # is_pos_or_named_passed_as_kwarg = \
-                #     name in etc.list_intersection(spec.args, list(kw.keys()))
-                return str(value) if is_pos_or_named_passed_as_arg else f"{_humanify(name)} {value}"
-
-            params = list(map(described, list(params_dict.items())))
-
-            def derepresent(string):
-                return string[1:-1]
-
-            params_string = self.params_separator.join(
-                list(map(derepresent, params)) if self.derepresent_params else params
-            )
-            params_values = list(params_dict.values())
-
-            def title_to_display():
-                return self.maybe_title or _humanify(func.__name__)
-
-            def params_to_display():
-                if not params_values:
-                    return ""
-                was_fn_called_with_some_args = args or kw
-                if len(params_values) == 1 and was_fn_called_with_some_args:
-                    item = next(iter(params_dict.items()))
-                    if item[0] in kw.keys():
-                        return f" {item[0]} {item[1]}"
-                    else:
-                        return " " + params_values[0]
-                return (": " if title_to_display() else "") + params_string
-
-            def context():
-                # todo: refactor naming and make idiomatic
-                def is_method(fn):
-                    spec = inspect.getfullargspec(fn)
-                    return args and spec.args and spec.args[0] in ["cls", "self"]
-
-                maybe_module_name = func.__module__.split(".")[-1] if not is_method(func) else None
-
-                instance = args[0] if is_method(func) else None
-                instance_desc = str(instance)
-                maybe_instance_name = instance_desc if "at 0x" not in instance_desc else None
-                class_name = instance and instance.__class__.__name__
-
-                chainable_element_name = None
-                if isinstance(instance, ChainableNamingElement):
-                    chainable_element_name = instance.get_full_path()
-                context_name = chainable_element_name or maybe_module_name or maybe_instance_name or class_name
-
-                if not context_name:
-                    return ""
-
-                return f" {context_name}: "  # todo: make ` [...]` configurable;)
-
-            name_to_display = (
-                (context() if self.display_context else "")
-                + title_to_display()
-                + (params_to_display() if self.display_params else "")
-            )
-
-            translated_name = (
-                reduce(lambda text, item: text.replace(item[0], item[1]), self.translations, name_to_display)
-                if self.translations
-                else name_to_display
-            )
-
-            with StepContext(translated_name, params_dict):
+            def render_title():
+                rendered_params = {name: str(value) for name, value in params_dict.items()}
+                passed_as_args = set(spec.args[: len(args)])
+
+                def described(item):
+                    (name, value) = item
+                    is_pos_or_named_passed_as_arg = name in passed_as_args
+                    # has_defaults = spec.defaults or spec.kwonlydefaults
+                    # is_pos_or_named_passed_as_kwarg = \
+                    #     name in etc.list_intersection(spec.args, list(kw.keys()))
+                    return str(value) if is_pos_or_named_passed_as_arg else f"{_humanify(name)} {value}"
+
+                params = list(map(described, list(rendered_params.items())))
+
+                def derepresent(string):
+                    return string[1:-1]
+
+                params_string = self.params_separator.join(
+                    list(map(derepresent, params)) if self.derepresent_params else params
+                )
+                params_values = list(rendered_params.values())
+
+                def title_to_display():
+                    return self.maybe_title or _humanify(func.__name__)
+
+                def params_to_display():
+                    if not params_values:
+                        return ""
+                    was_fn_called_with_some_args = args or kw
+                    if len(params_values) == 1 and was_fn_called_with_some_args:
+                        item = next(iter(rendered_params.items()))
+                        if item[0] in kw.keys():
+                            return f" {item[0]} {item[1]}"
+                        else:
+                            return " " + params_values[0]
+                    return (": " if title_to_display() else "") + params_string
+
+                def context():
+                    # todo: refactor naming and make idiomatic
+                    is_method = bool(args) and is_method_like
+
+                    maybe_module_name = func.__module__.split(".")[-1] if not is_method else None
+
+                    instance = args[0] if is_method else None
+                    instance_desc = str(instance)
+                    maybe_instance_name = instance_desc if "at 0x" not in instance_desc else None
+                    class_name = instance and instance.__class__.__name__
+
+                    chainable_element_name = None
+                    if isinstance(instance, ChainableNamingElement):
+                        chainable_element_name = instance.get_full_path()
+                    context_name = chainable_element_name or maybe_module_name or maybe_instance_name or class_name
+
+                    if not context_name:
+                        return ""
+
+                    return f" {context_name}: "  # todo: make ` [...]` configurable;)
+
+                name_to_display = (
+                    (context() if self.display_context else "")
+                    + title_to_display()
+                    + (params_to_display() if self.display_params else "")
+                )
+
+                return (
+                    reduce(lambda text, item: text.replace(item[0], item[1]), self.translations, name_to_display)
+                    if self.translations
+                    else name_to_display
+                )
+
+            # rendered only if the step is kept in the report, see util/allure_steps.py
+            with StepContext(Rendered(render_title), params_dict):
                 return func(*args, **kw)
 
             # todo: consider supporting the following original params rendering
@@ -3,8 +3,9 @@ The code in this file is basically the code from selene.support, slightly modifi
 their hidden locators.
 """
 import re
-from functools import reduce
-from typing import Any, ContextManager, Dict, Iterable, Protocol, Tuple
+from functools import cache
+from typing import Any, Callable, ContextManager, Dict, Iterable, Protocol, Tuple
+from weakref import WeakKeyDictionary
 
 from selene import Collection, Element
 from selene.core.entity import Browser, WaitingEntity
@@ -41,6 +42,37 @@ class DefaultTranslations:
     ]
 
 
+# how many consecutive translation pairs are checked for presence in a title with a single regex search
+TRANSLATIONS_BLOCK_SIZE = 16
+
+
+@cache
+def compile_translations(translations: Tuple[Tuple[str, str], ...]) -> Callable[[str], str]:
+    """
+    Compiles (from, to) substitution pairs into a translator giving the same result as reduce(str.replace) over them.
+    The pairs are applied one after another, since a substitution result can be matched by a later pair, even across
+    its boundary (a key code is named only after "((" is collapsed). Most titles match a few pairs only, so the pairs
+    are split into blocks with a regex of their patterns each, and a block none of whose patterns is in the title
+    is skipped: no pair of it applies, so none of them can produce a pattern for the next ones.
+    """
+    blocks = [
+        translations[start : start + TRANSLATIONS_BLOCK_SIZE]
+        for start in range(0, len(translations), TRANSLATIONS_BLOCK_SIZE)
+    ]
+    compiled_blocks = [(re.compile("|".join(re.escape(old) for old, _ in block)), block) for block in blocks]
+
+    def translate(text: str) -> str:
+        for pattern, block in compiled_blocks:
+            if pattern.search(text) is None:
+                continue
+            for old, new in block:
+                if old in text:
+                    text = text.replace(old, new)
+        return text
+
+    return translate
+
+
 def wait_with(
     *,
     context: _ContextManagerFactory,
@@ -63,33 +95,30 @@ def wait_with(
         to apply to final title string to log
     """
 
+    translate = compile_translations(tuple(translations))
+    # translated titles and locators of elements and collections per (entity, its full name, command), an element is
+    # usually asked to do the same few commands over and over again
+    steps_cache: WeakKeyDictionary = WeakKeyDictionary()
+
     def decorator_factory(wait):
         def decorator(for_):
             def decorated(fn):
-                title = f"{wait.entity}: {fn}"
-
-                # full_description is from monkeypathing of selene's element
-                if isinstance(wait.entity, Element) or isinstance(wait.entity, Collection):
-                    title = f"{wait.entity.full_description}: {fn}"
-
-                def translate(initial: str, item: Tuple[str, str]):
-                    old, new = item
-                    return initial.replace(old, new)
-
-                translated_title = reduce(
-                    translate,
-                    translations,
-                    title,
-                )
-                params = {}
-                if isinstance(wait.entity, Element) or isinstance(wait.entity, Collection):
-                    translated_locator = reduce(
-                        translate,
-                        translations,
-                        str(wait.entity),
-                    )
-                    params = {"locator": translated_locator}
-                with context(title=translated_title, params=params):
+                entity = wait.entity
+                if isinstance(entity, Element) or isinstance(entity, Collection):
+                    entity_steps = steps_cache.setdefault(entity, {})
+                    # full_description is from monkeypathing of selene's element, it includes the whole name chain,
+                    # so a renamed element or a changed chain gets a new title
+                    full_description = entity.full_description
+                    key = (full_description, str(fn))
+                    step = entity_steps.get(key)
+                    if step is None:
+                        title = translate(f"{full_description}: {fn}")
+                        step = entity_steps[key] = (title, {"locator": translate(str(entity))})
+                    title, params = step
+                else:
+                    title, params = translate(f"{entity}: {fn}"), {}
+
+                with context(title=title, params=dict(params)):
                     return for_(fn)
 
             return decorated
@@ -1,3 +1,4 @@
+import threading
 from typing import Callable, Dict
 
 from selenium import webdriver
@@ -16,25 +17,51 @@ from util.web.assist.selenium.types import WebDriverOptions
 
 from . import supported
 
+_install_lock = threading.Lock()
+_installed_driver_paths: Dict[supported.BrowserName, str] = {}
+
+
+def _installed_driver_path(name: supported.BrowserName, install: Callable[[], str]) -> str:
+    """
+    A driver is installed once per process: installing checks the latest version online,
+    and parallel installs of the same driver conflict
+    """
+    with _install_lock:
+        if name not in _installed_driver_paths:
+            _installed_driver_paths[name] = install()
+        return _installed_driver_paths[name]
+
+
 installers: Dict[supported.BrowserName, Callable[[WebDriverOptions | None], WebDriver]] = {
     supported.chrome: lambda opts: webdriver.Chrome(
-        service=ChromeService(executable_path=settings.chromedriver_path or ChromeDriverManager().install()),
+        service=ChromeService(
+            executable_path=settings.chromedriver_path
+            or _installed_driver_path(supported.chrome, lambda: ChromeDriverManager().install())
+        ),
         options=opts,
     ),
     supported.chromium: lambda opts: webdriver.Chrome(
-        service=ChromeService(executable_path=ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install()),
+        service=ChromeService(
+            executable_path=_installed_driver_path(
+                supported.chromium, lambda: ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install()
+            )
+        ),
         options=opts,
     ),
     supported.firefox: lambda opts: webdriver.Firefox(
-        service=FFService(executable_path=GeckoDriverManager().install()),
+        service=FFService(
+            executable_path=_installed_driver_path(supported.firefox, lambda: GeckoDriverManager().install())
+        ),
         options=opts,
     ),
     supported.ie: lambda opts: webdriver.Ie(
-        service=IEService(executable_path=(IEDriverManager().install())),
+        service=IEService(executable_path=_installed_driver_path(supported.ie, lambda: IEDriverManager().install())),
         options=opts,
     ),
     supported.edge: lambda ____: webdriver.Edge(
-        service=EdgeService(executable_path=EdgeChromiumDriverManager().install()),
+        service=EdgeService(
+            executable_path=_installed_driver_path(supported.edge, lambda: EdgeChromiumDriverManager().install())
+        ),
     ),
 }
 